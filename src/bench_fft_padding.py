@@ -0,0 +1,74 @@
+"""Benchmark del relleno hasta tamaños rápidos de FFT (`padding`)
+
+Mide la primera llamada a `ffts_filter_lowpass_detailed` (transformada
+directa, máscara, inversa y análisis) sobre imágenes a color de tamaños
+incómodos para la FFT (con factores primos grandes), sin relleno y con
+`padding="reflect"`, en cada backend. Cada medición usa una instancia nueva,
+así que el espectro nunca viene de la caché. También reporta la diferencia
+media en niveles de gris que introduce el relleno.
+
+Ejemplo:
+    python bench_fft_padding.py
+    python bench_fft_padding.py --size 1009x1013 --backend numpy --repeat 3
+"""
+import argparse
+import sys
+
+import cv2 as cv
+import numpy as np
+from logics.batch_io import best_time, parse_size
+from logics.fft_backends import available_backends
+from logics.filters import filters
+
+DEFAULT_SIZES = ("2003x3001", "1009x1013", "4001x1999")
+DEFAULT_BACKENDS = ("numpy", "scipy")
+PADDINGS = (None, "reflect")
+
+
+def _test_image(rows, cols, seed):
+    """Ruido suavizado a color: tiene energía en todas las frecuencias pero no es ruido blanco"""
+    rng = np.random.default_rng(seed)
+    return cv.GaussianBlur(rng.integers(0, 256, (rows, cols, 3), dtype=np.uint8), (9, 9), 0)
+
+
+def _cold_lowpass(image, backend, padding, radio, repeat):
+    """Mejor tiempo de la primera llamada (instancia nueva en cada repetición)"""
+    best, (result, analysis, _) = best_time(
+        filters.ffts_filter_lowpass_detailed, radio, repeat=repeat,
+        setup=lambda: filters.from_image(image, backend=backend, padding=padding))
+    return best, result, analysis["tamano_fft"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara el filtrado de Fourier con y sin relleno a tamaños rápidos")
+    parser.add_argument("--size", type=parse_size, action="append", default=[],
+                        help=f"Tamaño FILASxCOLUMNAS (repetible; por defecto {', '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--backend", action="append", default=[],
+                        help=f"Backend FFT (repetible; por defecto {', '.join(DEFAULT_BACKENDS)})")
+    parser.add_argument("--radio", type=float, default=0.14, help="Radio del pasa bajas")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones por medición (se toma la mejor)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de las imágenes")
+    args = parser.parse_args(argv)
+
+    backends = [name for name in (args.backend or DEFAULT_BACKENDS) if name in available_backends()]
+    if not backends:
+        print(f"❌ Ningún backend disponible entre {args.backend or DEFAULT_BACKENDS}")
+        return 1
+
+    for rows, cols in args.size or [parse_size(size) for size in DEFAULT_SIZES]:
+        image = _test_image(rows, cols, args.seed)
+        for backend in backends:
+            times = {}
+            results = {}
+            for padding in PADDINGS:
+                times[padding], results[padding], fft_size = _cold_lowpass(image, backend, padding,
+                                                                           args.radio, args.repeat)
+            diff = np.abs(results[None].astype(np.int16) - results["reflect"].astype(np.int16)).mean()
+            print(f"🔧 {backend:6s} {rows}x{cols} -> {fft_size[0]}x{fft_size[1]}: "
+                  f"sin relleno {times[None] * 1e3:.0f} ms, reflect {times['reflect'] * 1e3:.0f} ms "
+                  f"({times[None] / times['reflect']:.1f}x), diferencia media {diff:.2f} niveles")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
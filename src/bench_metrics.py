@@ -0,0 +1,68 @@
+"""Benchmark de `image_metrics` frente al cálculo anterior de las métricas
+
+Compara el código que tenía `ComparativeController._calculateMetrics` (MSE,
+PSNR, MAE, correlación y diferencia de color con copias float64 de las
+imágenes completas y `np.corrcoef`) con la pasada única de
+`logics.metrics.image_metrics`, y muestra la diferencia entre ambos
+resultados. Las imágenes son ruido uniforme de 8 bits comparado contra la
+misma imagen con el bit menos significativo invertido (correlación ~0.9999).
+
+Ejemplo:
+    python bench_metrics.py
+    python bench_metrics.py --size 2000x3000 --repeat 5
+"""
+import argparse
+import sys
+
+import numpy as np
+from logics.batch_io import best_time, parse_size
+from logics.metrics import image_metrics
+
+DEFAULT_SIZES = ("1000x1500", "4000x6000")
+
+
+def old_metrics(img1: np.ndarray, img2: np.ndarray) -> dict:
+    """Métricas como se calculaban antes de `image_metrics` (ComparativeController)"""
+    mse = float(np.mean((img1.astype(float) - img2.astype(float)) ** 2))
+    psnr = float('inf') if mse == 0 else float(20 * np.log10(255.0 / np.sqrt(mse)))
+    mae = float(np.mean(np.abs(img1.astype(float) - img2.astype(float))))
+    correlation = float(np.corrcoef(img1.flatten(), img2.flatten())[0, 1])
+    mean1 = np.mean(img1, axis=(0, 1))
+    mean2 = np.mean(img2, axis=(0, 1))
+    color_diff = float(np.mean(np.abs(mean1 - mean2)))
+    return {"mse": mse, "psnr": psnr, "mae": mae, "correlacion": correlation, "diferencia_color": color_diff}
+
+
+def new_metrics(img1: np.ndarray, img2: np.ndarray) -> dict:
+    quality = image_metrics(img1, img2)
+    quality["diferencia_color"] = float(np.mean(np.abs(quality.pop("diferencia_media_canal"))))
+    return quality
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara image_metrics con el cálculo anterior de las métricas")
+    parser.add_argument("--size", type=parse_size, action="append", default=[],
+                        help=f"Tamaño FILASxCOLUMNAS (repetible; por defecto {', '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición (se toma la mejor)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de las imágenes")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    for rows, cols in args.size or [parse_size(size) for size in DEFAULT_SIZES]:
+        image = rng.integers(0, 256, (rows, cols, 3), dtype=np.uint8)
+        other = image ^ 1
+
+        old_time, old = best_time(old_metrics, image, other, repeat=args.repeat)
+        new_time, new = best_time(new_metrics, image, other, repeat=args.repeat)
+
+        print(f"🔧 {rows}x{cols}x3 ({rows * cols / 1e6:.1f} MP): "
+              f"anterior {old_time * 1e3:.0f} ms, image_metrics {new_time * 1e3:.0f} ms "
+              f"({old_time / new_time:.1f}x)")
+        for key in old:
+            error = abs(new[key] - old[key]) / max(abs(old[key]), 1e-12)
+            print(f"   {key:16s} anterior {old[key]:.9f}  nuevo {new[key]:.9f}  error relativo {error:.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Comprobación de la precisión float32 frente a float64
+
+Filtra las mismas imágenes con `precision="float64"` y `precision="float32"`
+en todas las combinaciones de backend, motor, padding y modo de color, y
+verifica que la imagen resultante no difiera en más de `MAX_PIXEL_DIFF`
+niveles de gris. Cubre las máscaras del banco de filtros, el lowpass con
+espectro recortado y `tiled_fft_filter`; además compara la energía retenida.
+Las métricas (`image_metrics`, `ssim`, `ms_ssim`, `tiled_metrics`) se
+comparan igual entre ambas precisiones, con cotas de error relativo.
+Termina con código 1 si alguna combinación supera la cota.
+
+Ejemplo:
+    python check_precision.py
+    python check_precision.py ../images_pr/imagenes_a_color/*.jpg
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import cv2 as cv
+import numpy as np
+from logics.fft_backends import available_backends
+from logics.filters import COLOR_MODES, FFT_ENGINES, filters
+from logics.metrics import image_metrics, ms_ssim, ssim
+from logics.tiled_filter import tiled_fft_filter
+from logics.tiled_metrics import tiled_metrics
+
+MAX_PIXEL_DIFF = 1
+MAX_ENERGY_DIFF = 1e-3  # puntos porcentuales de energía retenida
+MAX_METRIC_ERROR = 1e-5  # error relativo de cada métrica float32 frente a float64
+METRIC_KEYS = ("mse", "psnr", "mae", "correlacion")
+
+DEFAULT_IMAGES = (Path(__file__).resolve().parent.parent / "images_pr" / "Baboon_gray_512_512_variance_25.png",)
+
+BANK_SPECS = [
+    ("lowpass", 0.05),
+    ("lowpass", 0.14),
+    ("highpass", 0.14),
+    ("highpass", 0.4),
+    ("bandpass", (0.1, 0.3)),
+    ("bandreject", (0.1, 0.3)),
+    ("notch", 0.02, [(20, 3)]),
+]
+
+
+def _pixel_diff(a, b) -> int:
+    return int(np.abs(a.astype(np.int16) - b.astype(np.int16)).max())
+
+
+def _synthetic_image(seed=0):
+    """Imagen a color de tamaño impar (97x130) para cubrir la rejilla simétrica de rfft"""
+    rng = np.random.default_rng(seed)
+    image = cv.GaussianBlur(rng.integers(0, 256, (97, 130, 3), dtype=np.uint8), (5, 5), 0)
+    return image
+
+
+def check_image(name, image):
+    """Recorre todas las combinaciones sobre una imagen; devuelve (peor diferencia, fallos)"""
+    worst = 0
+    failures = []
+
+    def record(label, diff):
+        nonlocal worst
+        worst = max(worst, diff)
+        if diff > MAX_PIXEL_DIFF:
+            failures.append(f"{name} {label}: {diff} niveles")
+
+    for backend in available_backends():
+        for engine in FFT_ENGINES:
+            for padding in (None, "reflect"):
+                for color_mode in COLOR_MODES:
+                    label = f"[{backend}/{engine}/{padding}/{color_mode}]"
+                    exact = filters.from_image(image, engine, backend, padding, color_mode)
+                    fast = filters.from_image(image, engine, backend, padding, color_mode, "float32")
+
+                    for spec, (img_a, an_a, _), (img_b, an_b, _) in zip(
+                            BANK_SPECS, exact.filter_bank(BANK_SPECS), fast.filter_bank(BANK_SPECS)):
+                        record(f"{label} {spec[0]} {spec[1]}", _pixel_diff(img_a, img_b))
+                        for ch_a, ch_b in zip(an_a["canales"], an_b["canales"]):
+                            energy = abs(ch_a["energia_retenida_porcentaje"] - ch_b["energia_retenida_porcentaje"])
+                            if energy > MAX_ENERGY_DIFF:
+                                failures.append(f"{name} {label} {spec[0]}: energía difiere {energy:.2e}")
+
+                    record(f"{label} lowpass crop",
+                           _pixel_diff(exact.ffts_filter_lowpass(0.05, crop=True),
+                                       fast.ffts_filter_lowpass(0.05, crop=True)))
+
+    for filter_type in ("lowpass", "highpass"):
+        record(f"[tiled] {filter_type}",
+               _pixel_diff(tiled_fft_filter(image, 0.1, filter_type, tile_size=128),
+                           tiled_fft_filter(image, 0.1, filter_type, tile_size=128, precision="float32")))
+
+    return worst, failures
+
+
+def check_metrics(name, image):
+    """Métricas float32 frente a float64 contra su pasa bajas y su bit bajo invertido; devuelve (peor error, fallos)"""
+    filtered = filters.from_image(image).ffts_filter_lowpass(0.1)
+    pairs = {"pasa bajas": filtered, "bit menos significativo": image ^ 1}
+    worst = 0.0
+    failures = []
+
+    def record(label, exact, fast):
+        nonlocal worst
+        error = abs(fast - exact) / max(abs(exact), 1e-12)
+        worst = max(worst, error)
+        if error > MAX_METRIC_ERROR:
+            failures.append(f"{name} {label}: error relativo {error:.1e}")
+
+    for pair, other in pairs.items():
+        exact = image_metrics(image, other)
+        fast = image_metrics(image, other, precision="float32")
+        for key in METRIC_KEYS:
+            record(f"[{pair}] {key}", exact[key], fast[key])
+        record(f"[{pair}] ssim", ssim(image, other, precision="float64"), ssim(image, other, precision="float32"))
+        if min(image.shape[:2]) >= 7 * 2 ** 4:
+            record(f"[{pair}] ms_ssim", ms_ssim(image, other, win_size=7, precision="float64"),
+                   ms_ssim(image, other, win_size=7, precision="float32"))
+
+        exact = tiled_metrics(image, other, memory_budget_mb=1, precision="float64")
+        fast = tiled_metrics(image, other, memory_budget_mb=1, precision="float32")
+        for key in METRIC_KEYS + ("ssim",):
+            record(f"[{pair}] tiled {key}", exact[key], fast[key])
+
+    return worst, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comprueba que precision='float32' no se aleje más de "
+                                                 f"{MAX_PIXEL_DIFF} nivel de gris del resultado en float64")
+    parser.add_argument("images", nargs="*", help="Imágenes a comprobar (por defecto Baboon y una sintética impar)")
+    args = parser.parse_args(argv)
+
+    images = {"sintética 97x130": _synthetic_image()}
+    for path in args.images or DEFAULT_IMAGES:
+        image = cv.imread(str(path))
+        if image is None:
+            print(f"❌ No se pudo leer {path}")
+            return 1
+        images[Path(path).name] = image
+
+    worst = 0
+    worst_metric = 0.0
+    failures = []
+    for name, image in images.items():
+        image_worst, image_failures = check_image(name, image)
+        metric_worst, metric_failures = check_metrics(name, image)
+        print(f"🔧 {name}: diferencia máxima {image_worst} niveles, error relativo de métricas {metric_worst:.1e}")
+        worst = max(worst, image_worst)
+        worst_metric = max(worst_metric, metric_worst)
+        failures.extend(image_failures + metric_failures)
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+    print(f"✅ float32 dentro de {MAX_PIXEL_DIFF} nivel de gris (máximo observado: {worst}) y métricas "
+          f"dentro de {MAX_METRIC_ERROR:.0e} de error relativo (máximo observado: {worst_metric:.1e})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
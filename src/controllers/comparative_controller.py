@@ -1,17 +1,16 @@
 from PySide6.QtCore import QObject, Signal, Slot, Property
-from pathlib import Path
 import cv2 as cv
 import numpy as np
-from skimage.metrics import structural_similarity as ssim
-import tempfile
+from controllers.image_provider import result_images
+from logics.metrics import image_metrics, ssim
 
 
 class ComparativeController(QObject):
     image1Loaded = Signal(str)
     image2Loaded = Signal(str)
     diffImageReady = Signal(str)
-    histogram1Ready = Signal(str)
-    histogram2Ready = Signal(str)
+    histogram1Ready = Signal(list)  # Bins por canal (B, G, R), normalizados a [0, 1]
+    histogram2Ready = Signal(list)
     metricsChanged = Signal()
 
     def __init__(self):
@@ -61,33 +60,18 @@ class ComparativeController(QObject):
             print(f"Error loading image 2: {e}")
 
     def _generateHistogram(self, img, img_num):
-        """Genera histograma RGB"""
-        import matplotlib
-        matplotlib.use('Agg')
-        import matplotlib.pyplot as plt
+        """Calcula el histograma por canal; QML lo dibuja (HistogramChart.qml)"""
+        channels = 1 if img.ndim == 2 else img.shape[2]
+        hists = [cv.calcHist([img], [i], None, [256], [0, 256]).ravel() for i in range(channels)]
 
-        colors = ('b', 'g', 'r')
-        plt.figure(figsize=(8, 4))
-
-        for i, color in enumerate(colors):
-            hist = cv.calcHist([img], [i], None, [256], [0, 256])
-            plt.plot(hist, color=color, label=f'Canal {color.upper()}')
-
-        plt.xlim([0, 256])
-        plt.xlabel('Intensidad de píxel')
-        plt.ylabel('Frecuencia')
-        plt.title(f'Histograma Imagen {img_num}')
-        plt.legend()
-        plt.grid(alpha=0.3)
-
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-        plt.savefig(temp_file.name, bbox_inches='tight', dpi=100)
-        plt.close()
+        # Misma escala para todos los canales, como en una sola gráfica
+        peak = max(float(h.max()) for h in hists) or 1.0
+        bins = [(h / peak).tolist() for h in hists]
 
         if img_num == 1:
-            self.histogram1Ready.emit(f"file://{temp_file.name}")
+            self.histogram1Ready.emit(bins)
         else:
-            self.histogram2Ready.emit(f"file://{temp_file.name}")
+            self.histogram2Ready.emit(bins)
 
     def _calculateMetrics(self):
         if self._img1 is None or self._img2 is None:
@@ -105,31 +89,19 @@ class ComparativeController(QObject):
             img2_resized = self._img2
             self._size_match = "Tamaños idénticos"
 
-        # MSE
-        self._mse = float(np.mean((img1_resized.astype(float) - img2_resized.astype(float)) ** 2))
-
-        # PSNR
-        if self._mse == 0:
-            self._psnr = float('inf')
-        else:
-            self._psnr = float(20 * np.log10(255.0 / np.sqrt(self._mse)))
-
-        # MAE
-        self._mae = float(np.mean(np.abs(img1_resized.astype(float) - img2_resized.astype(float))))
+        # MSE, PSNR, MAE, correlación y diferencia de color en una sola pasada
+        quality = image_metrics(img1_resized, img2_resized)
+        self._mse = quality["mse"]
+        self._psnr = quality["psnr"]
+        self._mae = quality["mae"]
+        self._correlation = quality["correlacion"]
+        self._color_diff = float(np.mean(np.abs(quality["diferencia_media_canal"])))
 
         # SSIM (Structural Similarity Index)
         gray1 = cv.cvtColor(img1_resized, cv.COLOR_BGR2GRAY)
         gray2 = cv.cvtColor(img2_resized, cv.COLOR_BGR2GRAY)
         self._ssim = float(ssim(gray1, gray2))
 
-        # Correlación
-        self._correlation = float(np.corrcoef(img1_resized.flatten(), img2_resized.flatten())[0, 1])
-
-        # Diferencia de color promedio
-        mean1 = np.mean(img1_resized, axis=(0, 1))
-        mean2 = np.mean(img2_resized, axis=(0, 1))
-        self._color_diff = float(np.mean(np.abs(mean1 - mean2)))
-
         # Generar imagen de diferencia
         self._generateDifferenceImage(img1_resized, img2_resized)
 
@@ -147,9 +119,7 @@ class ComparativeController(QObject):
         gray_diff = cv.cvtColor(diff_enhanced, cv.COLOR_BGR2GRAY)
         heatmap = cv.applyColorMap(gray_diff, cv.COLORMAP_JET)
 
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-        cv.imwrite(temp_file.name, heatmap)
-        self.diffImageReady.emit(f"file://{temp_file.name}")
+        self.diffImageReady.emit(result_images.publish("difference_heatmap", heatmap))
 
     # Properties
     @Property(float, notify=metricsChanged)
@@ -1,10 +1,16 @@
 from PySide6.QtCore import QObject, Signal, Slot, Property
-from pathlib import Path
 import cv2 as cv
 import inspect
+from controllers.image_provider import result_images
+from controllers.scheduler import ProgressiveScheduler, downscale_for_preview
 from logics.filters import filters
 
 
+# Métodos públicos de `filters` que no son filtros y no se listan en la interfaz
+NON_FILTER_METHODS = ("compare_filters", "from_image", "radius_sweep", "filter_bank", "lowpass_crop_error",
+                      "with_luminance")
+
+
 class FilterController(QObject):
     imageLoaded = Signal(str)
     filterApplied = Signal(str)  # Ahora emite la ruta de la imagen procesada
@@ -12,11 +18,25 @@ class FilterController(QObject):
     filterParametersChanged = Signal()
     errorOccurred = Signal(str)
 
+    # Señales internas: el hilo de trabajo entrega el resultado al hilo de la interfaz
+    _filterFinished = Signal(int, object, bool)
+    _filterFailed = Signal(int, str)
+
     def __init__(self):
         super().__init__()
+        # Vista previa inmediata sobre la imagen reducida y resolución completa
+        # cuando los parámetros dejan de cambiar
+        self._scheduler = ProgressiveScheduler(self._computePreview, self._computeFilter, parent=self)
+        self._filterFinished.connect(self._onFilterFinished)
+        self._filterFailed.connect(self._onFilterFailed)
+        self._full_delivered = -1  # Generación cuyo resultado completo ya se mostró
+        self._last_request = None  # (método, parámetros) de la última petición
+
         self._filter_instance = None
+        self._preview_instance = None
+        self._preview_factor = 1.0
         self._original_path = ""
-        self._processed_path = ""
+        self._processed_image = None
         self._available_filters = []
         self._current_filter_params = {}
         self._param_values = {}
@@ -29,6 +49,17 @@ class FilterController(QObject):
         try:
             self._filter_instance = filters(path)
             self._original_path = path
+            self._processed_image = None
+            self._last_request = None
+
+            # Imagen reducida para la vista previa (None si la imagen ya es pequeña)
+            preview_image, self._preview_factor = downscale_for_preview(self._filter_instance.image)
+            self._preview_instance = None
+            if preview_image is not None:
+                self._preview_instance = filters.from_image(preview_image, self._filter_instance.engine,
+                                                            self._filter_instance.backend)
+            self._scheduler.invalidate()
+
             self._available_filters = self._getFilterMethods()
             self.filterListChanged.emit()
             self.imageLoaded.emit(file_path)
@@ -121,37 +152,92 @@ class FilterController(QObject):
                     else:
                         converted_params[param_name] = param_value
 
-            # Aplicar filtro
-            method = getattr(self._filter_instance, self._selected_filter)
-            filtered_img = method(**converted_params)
-
-            # Guardar resultado
-            temp_dir = Path("/tmp/filter_results")
-            temp_dir.mkdir(exist_ok=True)
-            result_path = temp_dir / f"{self._selected_filter}_result.png"
-
-            cv.imwrite(str(result_path), filtered_img)
-            self._processed_path = str(result_path)
-
-            # Emitir señal con la ruta
-            self.filterApplied.emit(f"file://{result_path}")
+            # Programar el filtro: vista previa y luego resolución completa
+            self._last_request = (self._selected_filter, converted_params)
+            full_args = (self._filter_instance, self._selected_filter, converted_params)
+            preview_args = None
+            if self._preview_instance is not None:
+                preview_params = self._scalePreviewParams(converted_params, self._preview_factor)
+                preview_args = (self._preview_instance, self._selected_filter, preview_params)
+            self._scheduler.request(full_args, preview_args)
 
         except Exception as e:
             self.errorOccurred.emit(f"Error al aplicar filtro: {e}")
             import traceback
             traceback.print_exc()
 
+    @staticmethod
+    def _scalePreviewParams(params: dict, factor: float) -> dict:
+        """Ajusta los parámetros espaciales (en píxeles) a la escala de la imagen reducida
+
+        El radio de Fourier está normalizado y no cambia.
+        """
+        scaled = dict(params)
+        if 'ksize' in scaled:
+            ksize = max(1, round(scaled['ksize'] * factor))
+            scaled['ksize'] = ksize if ksize % 2 == 1 else ksize + 1
+        if 'sigma' in scaled:
+            scaled['sigma'] = scaled['sigma'] * factor
+        return scaled
+
+    def _computePreview(self, generation, filter_instance, method_name, params):
+        """Trabajo del hilo de vista previa"""
+        self._computeFilter(generation, filter_instance, method_name, params, preview=True)
+
+    def _computeFilter(self, generation, filter_instance, method_name, params, preview=False):
+        """Trabajo del hilo: aplica el filtro y entrega la imagen al hilo de la interfaz"""
+        try:
+            filtered_img = getattr(filter_instance, method_name)(**params)
+            if self._scheduler.is_current(generation):
+                self._filterFinished.emit(generation, filtered_img, preview)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self._filterFailed.emit(generation, f"Error al aplicar filtro: {e}")
+
+    @Slot(int, object, bool)
+    def _onFilterFinished(self, generation, filtered_img, preview):
+        """Publica el resultado en el hilo de la interfaz (si sigue siendo el más reciente)"""
+        if not self._scheduler.is_current(generation):
+            return
+        if preview:
+            # Una vista previa tardía no reemplaza al resultado completo de la misma petición
+            if self._full_delivered == generation:
+                return
+            result_url = result_images.publish("filter_preview", filtered_img)
+        else:
+            self._full_delivered = generation
+            self._processed_image = filtered_img
+            result_url = result_images.publish("filter_result", filtered_img)
+
+        # Emitir señal con la URL (en memoria, sin PNG ni disco)
+        self.filterApplied.emit(result_url)
+
+    @Slot(int, str)
+    def _onFilterFailed(self, generation, error_msg):
+        if self._scheduler.is_current(generation):
+            self.errorOccurred.emit(error_msg)
+
     @Slot(str)
     def saveImage(self, save_path: str):
         """Guarda imagen procesada"""
-        if not self._processed_path:
+        if self._last_request is not None and self._full_delivered != self._scheduler.generation:
+            # El resultado completo de la última petición aún no llega: se calcula aquí
+            method_name, params = self._last_request
+            try:
+                self._processed_image = getattr(self._filter_instance, method_name)(**params)
+                self._full_delivered = self._scheduler.generation
+            except Exception as e:
+                self.errorOccurred.emit(f"Error al aplicar filtro: {e}")
+                return
+
+        if self._processed_image is None:
             self.errorOccurred.emit("No hay imagen procesada para guardar")
             return
 
         try:
             save_path = save_path.replace("file://", "")
-            img = cv.imread(self._processed_path)
-            cv.imwrite(save_path, img)
+            cv.imwrite(save_path, self._processed_image)
         except Exception as e:
             self.errorOccurred.emit(f"Error al guardar imagen: {e}")
 
@@ -171,7 +257,7 @@ class FilterController(QObject):
             if method_name.startswith('_') or not callable(getattr(self._filter_instance, method_name)):
                 continue
 
-            if 'detailed' in method_name.lower() or method_name.lower() == "compare_filters":
+            if 'detailed' in method_name.lower() or method_name.lower() in NON_FILTER_METHODS:
                 continue
 
             try:
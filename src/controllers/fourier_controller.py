@@ -1,10 +1,11 @@
 from PySide6.QtCore import QObject, Signal, Slot, Property
-from pathlib import Path
 import cv2 as cv
 import numpy as np
 from logics.filters import filters
+from controllers.image_provider import result_images
+from controllers.scheduler import ProgressiveScheduler, downscale_for_preview
+from logics.metrics import image_metrics, ssim
 from typing import Dict, Any
-from skimage.metrics import structural_similarity as ssim
 
 
 class FourierController(QObject):
@@ -12,11 +13,24 @@ class FourierController(QObject):
     analysisReady = Signal()
     errorOccurred = Signal(str)
 
+    # Señales internas: el hilo de trabajo entrega el resultado al hilo de la interfaz
+    _filterFinished = Signal(int, object, object)
+    _filterFailed = Signal(int, str)
+
     def __init__(self):
         super().__init__()
+        # Vista previa inmediata sobre la imagen reducida y resolución completa
+        # cuando el radio deja de cambiar; las peticiones obsoletas se descartan
+        self._scheduler = ProgressiveScheduler(self._computePreview, self._computeFourierFilter, parent=self)
+        self._full_delivered = -1  # Generación cuyo resultado completo ya se mostró
+        self._filterFinished.connect(self._onFilterFinished)
+        self._filterFailed.connect(self._onFilterFailed)
+
         self._current_image_path = ""
         self._filter_instance = None
         self._original_image = None
+        self._preview_instance = None
+        self._preview_original = None
         self._current_analysis = {
             'mse': 0.0,
             'psnr': 0.0,
@@ -34,9 +48,25 @@ class FourierController(QObject):
         """Carga imagen desde path (soporta file:// URLs)"""
         path = file_path.replace("file://", "")
         try:
-            self._filter_instance = filters(path)
-            self._original_image = cv.imread(path, cv.IMREAD_GRAYSCALE)
+            # La vista es en escala de grises: solo la luminancia pasa por la FFT (un plano, no tres),
+            # en precisión simple (sobra para imágenes de 8 bits)
+            self._filter_instance = filters(path, color_mode="gray", precision="float32")
+            self._original_image = self._filter_instance.luminance
             self._current_image_path = path
+
+            # Imagen reducida para la vista previa (None si la imagen ya es pequeña)
+            preview_image, _ = downscale_for_preview(self._original_image)
+            if preview_image is None:
+                self._preview_instance = None
+                self._preview_original = None
+            else:
+                self._preview_instance = filters.from_image(preview_image, self._filter_instance.engine,
+                                                            self._filter_instance.backend, color_mode="gray",
+                                                            precision="float32")
+                self._preview_original = preview_image
+
+            # Cualquier filtro en curso pertenece a la imagen anterior
+            self._scheduler.invalidate()
             self.imageLoaded.emit(file_path)
             print(f"✅ Imagen cargada: {path}, shape: {self._original_image.shape}")
         except Exception as e:
@@ -60,19 +90,44 @@ class FourierController(QObject):
         Aplica filtro de Fourier
         filterType: 'lowpass' o 'highpass'
         radio: float entre 0.01 y 0.5
+
+        Las ráfagas de peticiones (p. ej. al mover el slider) se agrupan: primero
+        se publica una vista previa sobre la imagen reducida y, cuando el radio
+        deja de cambiar, el resultado a resolución completa. Ambos llegan con
+        `analysisReady`; `currentAnalysis['preview']` indica cuál es.
         """
         if not self._current_image_path or self._original_image is None:
             self.errorOccurred.emit("No hay imagen cargada")
             return
 
+        full_args = (self._filter_instance, self._original_image, filterType, radio)
+        preview_args = None
+        if self._preview_instance is not None:
+            preview_args = (self._preview_instance, self._preview_original, filterType, radio)
+        self._scheduler.request(full_args, preview_args)
+
+    def _isSuperseded(self, request_id: int) -> bool:
+        return not self._scheduler.is_current(request_id)
+
+    def _computePreview(self, request_id, filter_instance, original_image, filterType, radio):
+        """Trabajo del hilo de vista previa: mismo cálculo sobre la imagen reducida"""
+        self._computeFourierFilter(request_id, filter_instance, original_image, filterType, radio, preview=True)
+
+    def _computeFourierFilter(self, request_id, filter_instance, original_image, filterType, radio,
+                              preview=False):
+        """Trabajo del hilo: filtra, calcula SSIM y escribe las visualizaciones"""
         try:
-            print(f"🔧 Aplicando filtro {filterType} con radio {radio}")
+            print(f"🔧 Aplicando filtro {filterType} con radio {radio}" + (" (vista previa)" if preview else ""))
 
             # Aplicar filtro correspondiente
             if filterType == "lowpass":
-                filtered_img, analysis, viz = self._filter_instance.ffts_filter_lowpass_detailed(radio)
+                filtered_img, analysis, viz = filter_instance.ffts_filter_lowpass_detailed(radio)
             else:  # highpass
-                filtered_img, analysis, viz = self._filter_instance.ffts_filter_highpass_detailed(radio)
+                filtered_img, analysis, viz = filter_instance.ffts_filter_highpass_detailed(radio)
+
+            if self._isSuperseded(request_id):
+                print(f"⏭️ Filtro con radio {radio} descartado (hay una petición más reciente)")
+                return
 
             # DEBUG: Ver qué retorna el filtro
             print(f"🔍 Imagen filtrada - shape: {filtered_img.shape}, dtype: {filtered_img.dtype}, "
@@ -81,31 +136,30 @@ class FourierController(QObject):
             # Normalizar forma de imagen filtrada
             filtered_img_normalized = self._normalize_image_shape(filtered_img)
 
-            print(f"📐 Shapes - Original: {self._original_image.shape}, Filtrada: {filtered_img_normalized.shape}")
+            print(f"📐 Shapes - Original: {original_image.shape}, Filtrada: {filtered_img_normalized.shape}")
 
             # Asegurar que ambas imágenes tengan las mismas dimensiones
-            if self._original_image.shape != filtered_img_normalized.shape:
+            if original_image.shape != filtered_img_normalized.shape:
                 filtered_img_normalized = cv.resize(
                     filtered_img_normalized,
-                    (self._original_image.shape[1], self._original_image.shape[0])
+                    (original_image.shape[1], original_image.shape[0])
                 )
                 print(f"⚠️ Imagen redimensionada a: {filtered_img_normalized.shape}")
 
             # IMPORTANTE: Asegurar que AMBAS estén en uint8 [0, 255]
-            orig_uint8 = self._original_image.astype(np.uint8)
+            orig_uint8 = original_image.astype(np.uint8)
             filt_uint8 = np.clip(filtered_img_normalized, 0, 255).astype(np.uint8)
 
             print(f"🔍 Rangos - Original: [{orig_uint8.min()}, {orig_uint8.max()}], "
                   f"Filtrada: [{filt_uint8.min()}, {filt_uint8.max()}]")
 
-            # DEBUG: Ver diferencias píxel a píxel
-            diff = np.abs(orig_uint8.astype(np.float32) - filt_uint8.astype(np.float32))
-            print(f"🔍 Diferencia - min: {diff.min():.2f}, max: {diff.max():.2f}, mean: {diff.mean():.2f}")
-            print(
-                f"🔍 Píxeles diferentes: {np.count_nonzero(diff)} de {diff.size} ({np.count_nonzero(diff) / diff.size * 100:.2f}%)")
+            # DEBUG: Ver diferencias (todas las métricas en una sola pasada)
+            quality = image_metrics(orig_uint8, filt_uint8)
+            print(f"🔍 Diferencia - MAE: {quality['mae']:.2f}, MSE: {quality['mse']:.2f}, "
+                  f"correlación: {quality['correlacion']:.4f}")
 
             # Verificar si las imágenes son idénticas
-            if np.array_equal(orig_uint8, filt_uint8):
+            if quality["mse"] == 0:
                 print("⚠️ ADVERTENCIA: Las imágenes son IDÉNTICAS - el filtro no tuvo efecto")
                 ssim_value = 1.0
             else:
@@ -121,14 +175,9 @@ class FourierController(QObject):
 
             print(f"📊 Análisis - MSE={analysis.get('mse')}, PSNR={analysis.get('psnr')}, SSIM={ssim_value:.4f}")
 
-            # Guardar temporalmente las visualizaciones
-            temp_dir = Path("/tmp/fourier_analysis")
-            temp_dir.mkdir(exist_ok=True)
-
-            spectrum_orig_path = temp_dir / "spectrum_original.png"
-            spectrum_filt_path = temp_dir / "spectrum_filtered.png"
-            mask_path = temp_dir / "mask.png"
-            filtered_path = temp_dir / "filtered_image.png"
+            if self._isSuperseded(request_id):
+                print(f"⏭️ Filtro con radio {radio} descartado (hay una petición más reciente)")
+                return
 
             # Normalizar espectros para visualización (0-255)
             spectrum_orig_norm = cv.normalize(viz['espectro_original'], None, 0, 255, cv.NORM_MINMAX, dtype=cv.CV_8U)
@@ -137,37 +186,63 @@ class FourierController(QObject):
             # Convertir máscara float a uint8
             mask_norm = (viz['mask'] * 255).astype(np.uint8)
 
-            cv.imwrite(str(spectrum_orig_path), spectrum_orig_norm)
-            cv.imwrite(str(spectrum_filt_path), spectrum_filt_norm)
-            cv.imwrite(str(mask_path), mask_norm)
-            cv.imwrite(str(filtered_path), filt_uint8)
+            # Publicar las visualizaciones en memoria (sin PNG ni disco). La vista
+            # previa usa sus propias claves para no pisar un resultado completo
+            prefix = "fourier_preview" if preview else "fourier"
+            spectrum_orig_url = result_images.publish(f"{prefix}_spectrum_original", spectrum_orig_norm)
+            spectrum_filt_url = result_images.publish(f"{prefix}_spectrum_filtered", spectrum_filt_norm)
+            mask_url = result_images.publish(f"{prefix}_mask", mask_norm)
+            filtered_url = result_images.publish(f"{prefix}_filtered", filt_uint8)
 
-            # Almacenar análisis con SSIM calculado
-            self._current_analysis = {
+            # Análisis con SSIM calculado
+            result_analysis = {
                 'mse': float(analysis.get('mse', 0.0)),
                 'psnr': float(analysis.get('psnr', 0.0)),
-                'ssim': float(ssim_value)
+                'ssim': float(ssim_value),
+                'preview': preview
             }
 
-            self._current_visualizations = {
-                'spectrum_original_path': f"file://{spectrum_orig_path}",
-                'spectrum_filtered_path': f"file://{spectrum_filt_path}",
-                'mask_path': f"file://{mask_path}",
-                'filtered_image_path': f"file://{filtered_path}"
+            result_visualizations = {
+                'spectrum_original_path': spectrum_orig_url,
+                'spectrum_filtered_path': spectrum_filt_url,
+                'mask_path': mask_url,
+                'filtered_image_path': filtered_url
             }
 
-            print(f"✅ SSIM: {self._current_analysis['ssim']:.4f} ({self._current_analysis['ssim'] * 100:.2f}%)")
-
-            self.analysisReady.emit()
-            print("🔔 Signal analysisReady emitido")
+            # Se entrega al hilo de la interfaz, que publica el resultado
+            self._filterFinished.emit(request_id, result_analysis, result_visualizations)
 
         except Exception as e:
             error_msg = f"Error al aplicar filtro: {e}"
             print(error_msg)
             import traceback
             traceback.print_exc()
-            self.errorOccurred.emit(error_msg)
+            self._filterFailed.emit(request_id, error_msg)
+
+    @Slot(int, object, object)
+    def _onFilterFinished(self, request_id, analysis, visualizations):
+        """Publica el resultado en el hilo de la interfaz (si sigue siendo el más reciente)"""
+        if self._isSuperseded(request_id):
+            return
+        if analysis['preview']:
+            # Una vista previa tardía no reemplaza al resultado completo de la misma petición
+            if self._full_delivered == request_id:
+                return
+        else:
+            self._full_delivered = request_id
+
+        self._current_analysis = analysis
+        self._current_visualizations = visualizations
 
+        print(f"✅ SSIM: {self._current_analysis['ssim']:.4f} ({self._current_analysis['ssim'] * 100:.2f}%)")
+
+        self.analysisReady.emit()
+        print("🔔 Signal analysisReady emitido")
+
+    @Slot(int, str)
+    def _onFilterFailed(self, request_id, error_msg):
+        if not self._isSuperseded(request_id):
+            self.errorOccurred.emit(error_msg)
 
     @Slot(float, result='QVariantMap')
     def compareFilters(self, radio: float) -> Dict[str, Any]:
@@ -179,9 +254,9 @@ class FourierController(QObject):
         try:
             print(f"⚖️ Comparando filtros con radio {radio}")
 
-            # Aplicar ambos filtros
-            lowpass_img, low_analysis, low_viz = self._filter_instance.ffts_filter_lowpass_detailed(radio)
-            highpass_img, high_analysis, high_viz = self._filter_instance.ffts_filter_highpass_detailed(radio)
+            # Aplicar ambos filtros con una sola transformada directa
+            (lowpass_img, low_analysis, low_viz), (highpass_img, high_analysis, high_viz) = \
+                self._filter_instance.filter_bank([("lowpass", radio), ("highpass", radio)])
 
             # Normalizar formas
             lowpass_img_norm = self._normalize_image_shape(lowpass_img)
@@ -208,19 +283,9 @@ class FourierController(QObject):
             low_sharpness = cv.Laplacian(low_uint8, cv.CV_64F).var()
             high_sharpness = cv.Laplacian(high_uint8, cv.CV_64F).var()
 
-            # Guardar temporalmente
-            temp_dir = Path("/tmp/fourier_comparison")
-            temp_dir.mkdir(exist_ok=True)
-
-            low_path = temp_dir / "lowpass_comparison.png"
-            high_path = temp_dir / "highpass_comparison.png"
-
-            cv.imwrite(str(low_path), low_uint8)
-            cv.imwrite(str(high_path), high_uint8)
-
             result = {
-                'lowpass_path': f"file://{low_path}",
-                'highpass_path': f"file://{high_path}",
+                'lowpass_path': result_images.publish("fourier_lowpass_comparison", low_uint8),
+                'highpass_path': result_images.publish("fourier_highpass_comparison", high_uint8),
                 'lowpass_mse': float(low_analysis.get('mse', 0.0)),
                 'highpass_mse': float(high_analysis.get('mse', 0.0)),
                 'lowpass_psnr': float(low_analysis.get('psnr', 0.0)),
@@ -0,0 +1,84 @@
+import threading
+import cv2 as cv
+import numpy as np
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+from PySide6.QtQml import QQmlImageProviderBase
+from PySide6.QtQuick import QQuickImageProvider
+
+
+# Nombre con el que se registra en el QQmlApplicationEngine (URLs image://results/...)
+PROVIDER_ID = "results"
+
+
+class ResultImageProvider(QQuickImageProvider):
+    """Sirve a QML las imágenes de resultados directamente desde memoria
+
+    Los controladores publican arreglos numpy con `publish(clave, arreglo)` y
+    reciben una URL `image://results/<clave>?v=<versión>`. La versión cambia en
+    cada publicación, así QML vuelve a pedir la imagen sin depender de la caché.
+    Nada pasa por PNG ni por disco.
+    """
+
+    def __init__(self):
+        super().__init__(QQmlImageProviderBase.ImageType.Image)
+        self._images = {}
+        self._versions = {}
+        # QML puede pedir imágenes desde su hilo de carga y los controladores
+        # publican desde hilos de trabajo
+        self._lock = threading.Lock()
+
+    def publish(self, key: str, image: np.ndarray) -> str:
+        """Guarda `image` bajo `key` y retorna su URL versionada"""
+        qimage = to_qimage(image)
+        with self._lock:
+            version = self._versions.get(key, 0) + 1
+            self._versions[key] = version
+            self._images[key] = qimage
+        return f"image://{PROVIDER_ID}/{key}?v={version}"
+
+    def requestImage(self, id, size, requestedSize):
+        key = id.split("?", 1)[0]
+        with self._lock:
+            image = self._images.get(key)
+        if image is None:
+            return QImage()
+
+        if size is not None:
+            size.setWidth(image.width())
+            size.setHeight(image.height())
+
+        # QImage es de datos compartidos: devolverla no copia los píxeles
+        if requestedSize is not None and requestedSize.isValid() and not requestedSize.isEmpty():
+            return image.scaled(requestedSize, Qt.AspectRatioMode.KeepAspectRatio,
+                                Qt.TransformationMode.SmoothTransformation)
+        return image
+
+
+def to_qimage(image: np.ndarray) -> QImage:
+    """Arreglo uint8 (gris, BGR o BGRA, en el orden de canales de OpenCV) -> QImage
+
+    La QImage se construye sobre el búfer del arreglo y se copia una sola vez,
+    porque Qt no puede mantener vivo el arreglo de numpy mientras la use.
+    """
+    image = np.ascontiguousarray(image)
+    if image.dtype != np.uint8:
+        image = np.clip(image, 0, 255).astype(np.uint8)
+
+    height, width = image.shape[:2]
+    if image.ndim == 2:
+        fmt = QImage.Format.Format_Grayscale8
+    elif image.shape[2] == 3:
+        fmt = QImage.Format.Format_BGR888
+    elif image.shape[2] == 4:
+        # Qt no tiene un formato BGRA por bytes: se reordena a RGBA (esta copia ya es contigua)
+        image = cv.cvtColor(image, cv.COLOR_BGRA2RGBA)
+        fmt = QImage.Format.Format_RGBA8888
+    else:
+        raise ValueError(f"Formato de imagen no soportado: {image.shape}")
+
+    return QImage(image.data, width, height, image.strides[0], fmt).copy()
+
+
+# Instancia compartida por todos los controladores; main.py la registra en el engine
+result_images = ResultImageProvider()
@@ -1,7 +1,7 @@
 from PySide6.QtCore import QObject, Signal, Slot, Property
-from pathlib import Path
 import cv2 as cv
 import inspect
+from controllers.image_provider import result_images
 from logics.noise import GenerateNoise
 
 
@@ -16,7 +16,7 @@ class NoiseController(QObject):
         super().__init__()
         self._noise_instance = None
         self._original_path = ""
-        self._processed_path = ""
+        self._processed_image = None
         self._available_noises = []
         self._current_noise_params = {}
         self._param_values = {}
@@ -48,7 +48,8 @@ class NoiseController(QObject):
 
             params = {}
             for param_name, param in sig.parameters.items():
-                if param_name == 'self':
+                # `rng` (semilla o Generator) no se edita desde la interfaz
+                if param_name in ('self', 'rng'):
                     continue
 
                 param_info = {
@@ -116,16 +117,12 @@ class NoiseController(QObject):
             method = getattr(self._noise_instance, self._selected_noise)
             noisy_img = method(**converted_params)
 
-            # Guardar resultado
-            temp_dir = Path("/tmp/noise_results")
-            temp_dir.mkdir(exist_ok=True)
-            result_path = temp_dir / f"{self._selected_noise}_result.png"
+            # Publicar resultado en memoria (sin PNG ni disco)
+            self._processed_image = noisy_img
+            result_url = result_images.publish("noise_result", noisy_img)
 
-            cv.imwrite(str(result_path), noisy_img)
-            self._processed_path = str(result_path)
-
-            # Emitir señal con la ruta
-            self.noiseApplied.emit(f"file://{result_path}")
+            # Emitir señal con la URL
+            self.noiseApplied.emit(result_url)
 
         except Exception as e:
             self.errorOccurred.emit(f"Error al aplicar ruido: {e}")
@@ -135,14 +132,13 @@ class NoiseController(QObject):
     @Slot(str)
     def saveImage(self, save_path: str):
         """Guarda imagen procesada"""
-        if not self._processed_path:
+        if self._processed_image is None:
             self.errorOccurred.emit("No hay imagen procesada para guardar")
             return
 
         try:
             save_path = save_path.replace("file://", "")
-            img = cv.imread(self._processed_path)
-            cv.imwrite(save_path, img)
+            cv.imwrite(save_path, self._processed_image)
         except Exception as e:
             self.errorOccurred.emit(f"Error al guardar imagen: {e}")
 
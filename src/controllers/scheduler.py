@@ -0,0 +1,106 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer
+import cv2 as cv
+
+
+# Lado mayor de la imagen reducida que se usa para la vista previa
+PREVIEW_MAX_SIDE = 512
+# Tiempo sin peticiones nuevas antes de calcular a resolución completa (ms)
+DEFAULT_SETTLE_MS = 250
+
+
+class _Task(QRunnable):
+    """Ejecuta `fn(*args)` en un hilo de QThreadPool"""
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self._fn = fn
+        self._args = args
+
+    def run(self):
+        self._fn(*self._args)
+
+
+def downscale_for_preview(image, max_side: int = PREVIEW_MAX_SIDE):
+    """Versión reducida de `image` para la vista previa
+
+    Retorna (imagen_reducida, factor). Si la imagen ya es pequeña retorna
+    (None, 1.0) y no hace falta vista previa.
+    """
+    height, width = image.shape[:2]
+    factor = max_side / max(height, width)
+    if factor >= 1.0:
+        return None, 1.0
+
+    size = (max(1, round(width * factor)), max(1, round(height * factor)))
+    return cv.resize(image, size, interpolation=cv.INTER_AREA), factor
+
+
+class ProgressiveScheduler(QObject):
+    """Agrupa ráfagas de peticiones y las resuelve en dos pasos
+
+    Cada `request` deja obsoletas a las anteriores (su generación cambia). La
+    vista previa se lanza de inmediato en su propio hilo, así no espera a un
+    cálculo completo en curso; el cálculo a resolución completa se lanza cuando
+    pasan `settle_ms` sin peticiones nuevas. Los trabajos reciben la generación
+    como primer argumento para descartar su resultado con `is_current`.
+    """
+
+    def __init__(self, preview_fn, full_fn, settle_ms: int = DEFAULT_SETTLE_MS, parent=None):
+        super().__init__(parent)
+        self._preview_fn = preview_fn
+        self._full_fn = full_fn
+        self._generation = 0
+        self._pending_args = None
+
+        # Un hilo por etapa: dentro de cada una los trabajos van en orden
+        self._preview_pool = QThreadPool(self)
+        self._preview_pool.setMaxThreadCount(1)
+        self._full_pool = QThreadPool(self)
+        self._full_pool.setMaxThreadCount(1)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(settle_ms)
+        self._timer.timeout.connect(self._startFull)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def request(self, full_args: tuple, preview_args: tuple = None):
+        """Programa una petición nueva
+
+        Con `preview_args` se calcula primero la vista previa y la resolución
+        completa espera a que las peticiones se calmen; sin ellos el cálculo
+        completo se encola de inmediato.
+        """
+        self._generation += 1
+        # Lo que aún no empezó ya no sirve
+        self._full_pool.clear()
+        self._pending_args = full_args
+
+        if preview_args is None:
+            self._timer.stop()
+            self._startFull()
+            return
+
+        self._preview_pool.clear()
+        self._preview_pool.start(_Task(self._preview_fn, self._generation, *preview_args))
+        self._timer.start()
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self._generation
+
+    def invalidate(self):
+        """Descarta todas las peticiones en cola o en curso"""
+        self._generation += 1
+        self._timer.stop()
+        self._pending_args = None
+        self._preview_pool.clear()
+        self._full_pool.clear()
+
+    def _startFull(self):
+        if self._pending_args is None:
+            return
+        args, self._pending_args = self._pending_args, None
+        self._full_pool.start(_Task(self._full_fn, self._generation, *args))
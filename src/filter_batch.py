@@ -0,0 +1,207 @@
+"""Filtrado por lotes sin interfaz gráfica
+
+Aplica uno o varios filtros de `logics.filters` a una lista de imágenes
+(archivos, directorios o patrones glob) con un pool de procesos. Cada imagen
+se escribe a disco en cuanto termina y al final se reporta el rendimiento
+(imágenes/s y MB/s de píxeles procesados). No importa PySide6.
+
+Ejemplo:
+    python filter_batch.py "../images_pr/imagenes_a_color/*.jpg" -o /tmp/filtradas \\
+        --filter "lowpass:radio=0.1,0.2" --filter "median:ksize=5" --workers 8
+
+Con --tile-size los filtros de Fourier se aplican por mosaicos (overlap-save,
+ver logics/tiled_filter.py), útil para imágenes de gigapíxeles.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import cv2 as cv
+from logics.batch_io import common_root, expand_inputs, expand_matrix, output_name, parse_spec
+from logics.fft_backends import PRECISIONS, get_backend
+from logics.filters import COLOR_MODES, filters
+from logics.tiled_filter import tiled_fft_filter
+
+
+# Nombres cortos de la línea de comandos -> métodos de `filters`
+FILTER_METHODS = {
+    "lowpass": "ffts_filter_lowpass",
+    "highpass": "ffts_filter_highpass",
+    "median": "apply_median_filter",
+    "gaussian": "apply_gaussian_filter",
+}
+
+# Filtros que admiten el modo por mosaicos -> tipo de máscara
+TILED_FILTERS = {
+    "lowpass": "lowpass",
+    "highpass": "highpass",
+}
+# Parámetros de `filters` que el modo por mosaicos no usa
+TILED_IGNORED_PARAMS = ("crop",)
+
+_worker_backend = None  # Backend FFT de cada proceso trabajador
+_worker_threads = 1  # Hilos de cada proceso trabajador
+_worker_padding = None  # Relleno hasta tamaños rápidos de FFT
+_worker_color_mode = "bgr"  # Canales que pasan por la FFT
+_worker_precision = "float64"  # Precisión de las transformadas
+
+
+def _init_worker(backend_name, fft_workers, padding=None, color_mode="bgr", precision="float64"):
+    """Crea el backend FFT una vez por proceso (sin repetir el micro-benchmark)"""
+    global _worker_backend, _worker_threads, _worker_padding, _worker_color_mode, _worker_precision
+    _worker_backend = get_backend(backend_name, fft_workers)
+    _worker_threads = fft_workers
+    _worker_padding = padding
+    _worker_color_mode = color_mode
+    _worker_precision = precision
+
+
+def _resolve_method(name: str) -> str:
+    method = FILTER_METHODS.get(name, name)
+    if method.startswith("_") or not callable(getattr(filters, method, None)):
+        raise ValueError(f"Filtro desconocido: {name} (usa {', '.join(FILTER_METHODS)})")
+    return method
+
+
+def _filter_image(image_path, relative, output_dir, combos, tile_size=None):
+    """Trabajo de un proceso: carga la imagen una vez y aplica todos los filtros"""
+    start = time.perf_counter()
+    instance = filters(str(image_path), backend=_worker_backend, padding=_worker_padding,
+                       color_mode=_worker_color_mode, precision=_worker_precision)
+    outputs = []
+
+    for name, params in combos:
+        if tile_size and name in TILED_FILTERS:
+            # Un hilo de FFT por mosaico y los mosaicos repartidos en los hilos del proceso
+            source = instance.image if _worker_color_mode == "bgr" else instance.luminance
+            # `crop` solo aplica a la FFT completa: los mosaicos ya trabajan por bloques
+            tiled_params = {key: value for key, value in params.items() if key not in TILED_IGNORED_PARAMS}
+            result = tiled_fft_filter(source, filter_type=TILED_FILTERS[name], tile_size=tile_size,
+                                      workers=_worker_threads, backend=_worker_backend.name,
+                                      precision=_worker_precision, **tiled_params)
+            if _worker_color_mode == "luminance":
+                result = instance.with_luminance(result)
+        else:
+            result = getattr(instance, _resolve_method(name))(**params)
+
+        relative_output = output_name(relative, name, params)
+        output_path = output_dir / relative_output
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not cv.imwrite(str(output_path), result):
+            raise ValueError(f"No se pudo escribir {output_path}")
+        outputs.append({"filter": name, "params": params, "output": str(relative_output)})
+
+    return {
+        "source": str(relative),
+        "bytes": int(instance.image.nbytes),
+        "seconds": time.perf_counter() - start,
+        "outputs": outputs
+    }
+
+
+def iter_batch(images, combos, output_dir, workers=None, backend=None, tile_size=None, padding=None,
+               color_mode="bgr", precision="float64"):
+    """Filtra `images` con cada (filtro, parámetros) de `combos` y produce cada resultado al terminar
+
+    El backend FFT se elige una vez aquí y los hilos de FFT se reparten entre
+    los procesos para no sobrecargar la máquina.
+    """
+    images = [Path(p).resolve() for p in images]
+    output_dir = Path(output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    root = common_root(images)
+
+    workers = workers or os.cpu_count() or 1
+    backend_name = get_backend(backend).name
+    fft_workers = max(1, (os.cpu_count() or 1) // workers)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backend_name, fft_workers, padding, color_mode, precision)) as pool:
+        futures = {
+            pool.submit(_filter_image, path, path.relative_to(root), output_dir, combos, tile_size): path
+            for path in images
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"source": str(futures[future]), "error": str(e)}
+
+
+def run(images, combos, output_dir, workers=None, backend=None, tile_size=None, padding=None, color_mode="bgr",
+        precision="float64"):
+    """Procesa el lote, escribe manifest.jsonl y reporta el rendimiento"""
+    if not images:
+        raise ValueError("No se encontraron imágenes")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    backend = get_backend(backend).name
+    print(f"🔧 {len(images)} imágenes x {len(combos)} filtros (backend FFT: {backend})")
+
+    start = time.perf_counter()
+    done, failed, total_bytes = 0, 0, 0
+    with open(output_dir / "manifest.jsonl", "w") as manifest:
+        for record in iter_batch(images, combos, output_dir, workers, backend, tile_size, padding, color_mode,
+                                 precision):
+            manifest.write(json.dumps(record) + "\n")
+            manifest.flush()
+            if "error" in record:
+                failed += 1
+                print(f"❌ Error con {record['source']}: {record['error']}")
+                continue
+
+            done += 1
+            total_bytes += record["bytes"]
+            elapsed = time.perf_counter() - start
+            print(f"✅ [{done + failed}/{len(images)}] {record['source']} ({record['seconds']:.2f}s) - "
+                  f"{done / elapsed:.2f} img/s, {total_bytes / 1e6 / elapsed:.1f} MB/s")
+
+    elapsed = time.perf_counter() - start
+    print(f"📊 {done} imágenes ({done * len(combos)} resultados) en {elapsed:.1f}s: "
+          f"{done / elapsed:.2f} img/s, {total_bytes / 1e6 / elapsed:.1f} MB/s, {failed} fallidas")
+    return done, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aplica filtros de Fourier/espaciales a muchas imágenes")
+    parser.add_argument("inputs", nargs="+", help="Archivos, directorios o patrones glob de imágenes")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directorio de salida")
+    parser.add_argument("--filter", action="append", default=[], dest="filters",
+                        help='Filtro y parámetros, p. ej. "lowpass:radio=0.1,0.2" o "median:ksize=5" (repetible)')
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto todos los núcleos)")
+    parser.add_argument("--backend", default=None, help="Backend FFT: numpy, scipy, opencv o auto")
+    parser.add_argument("--recursive", action="store_true", help="Buscar imágenes en subdirectorios")
+    parser.add_argument("--tile-size", type=int, default=None,
+                        help="Aplicar lowpass/highpass por mosaicos de este lado (imágenes muy grandes)")
+    parser.add_argument("--padding", choices=("reflect", "zero"), default=None,
+                        help="Rellenar hasta un tamaño rápido de FFT (tamaños con factores primos grandes)")
+    parser.add_argument("--color-mode", choices=COLOR_MODES, default="bgr",
+                        help="Filtrar en Fourier cada canal (bgr) o solo la luminancia, conservando el color "
+                             "(luminance) o en escala de grises (gray)")
+    parser.add_argument("--precision", choices=tuple(PRECISIONS), default="float64",
+                        help="Precisión de las FFT (float32 usa la mitad de memoria)")
+    args = parser.parse_args(argv)
+
+    if not args.filters:
+        parser.error("Indica al menos un --filter")
+
+    try:
+        specs = [parse_spec(spec) for spec in args.filters]
+        for name, _ in specs:
+            _resolve_method(name)
+        images = expand_inputs(args.inputs, args.recursive)
+        run(images, expand_matrix(specs), args.output_dir, args.workers, args.backend, args.tile_size,
+            args.padding, args.color_mode, args.precision)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import ast
+import glob
+import itertools
+import os
+import time
+from pathlib import Path
+
+
+# Utilidades compartidas por los scripts por lotes (noise_batch.py, filter_batch.py) y los bench_*.py
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+def find_images(input_dir: Path, recursive: bool = False):
+    """Imágenes de un directorio, en orden estable"""
+    pattern = "**/*" if recursive else "*"
+    return sorted(p for p in Path(input_dir).glob(pattern) if p.suffix.lower() in IMAGE_EXTENSIONS and p.is_file())
+
+
+def expand_inputs(inputs, recursive: bool = False):
+    """Convierte una lista de archivos, directorios o patrones glob en rutas de imágenes"""
+    images = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            images.extend(find_images(path, recursive))
+        elif path.is_file():
+            images.append(path)
+        else:
+            images.extend(sorted(
+                Path(p) for p in glob.glob(item, recursive=recursive)
+                if Path(p).suffix.lower() in IMAGE_EXTENSIONS and Path(p).is_file()
+            ))
+
+    # Sin duplicados, conservando el orden
+    unique = {}
+    for image in images:
+        unique.setdefault(image.resolve(), None)
+    return list(unique)
+
+
+def common_root(paths):
+    """Directorio común de varias rutas (para nombrar las salidas sin colisiones)"""
+    if not paths:
+        return Path.cwd()
+    return Path(os.path.commonpath([str(Path(p).parent) for p in paths]))
+
+
+def parse_spec(spec: str):
+    """"metodo:param=v1,v2;otro=v3" -> (metodo, {param: [v1, v2], otro: [v3]})"""
+    method, _, params_text = spec.partition(":")
+    method = method.strip()
+    params = {}
+    for item in filter(None, (p.strip() for p in params_text.split(";"))):
+        name, sep, values = item.partition("=")
+        if not sep:
+            raise ValueError(f"Parámetro mal formado en '{spec}': {item}")
+        params[name.strip()] = [_parse_value(v) for v in values.split(",")]
+    return method, params
+
+
+def _parse_value(text: str):
+    text = text.strip()
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def expand_matrix(specs):
+    """[(metodo, {param: [valores]})] -> lista de (metodo, {param: valor}) con el producto cartesiano"""
+    combos = []
+    for method, params in specs:
+        names = list(params)
+        values = [v if isinstance(v, list) else [v] for v in params.values()]
+        for combination in itertools.product(*values):
+            combos.append((method, dict(zip(names, combination))))
+    return combos
+
+
+def output_name(relative: Path, method: str, params: dict) -> Path:
+    """<metodo>/<subdirectorio relativo>/<nombre>__param-valor.png"""
+    suffix = "__".join(f"{k}-{v}" for k, v in params.items())
+    name = f"{relative.stem}__{suffix}.png" if suffix else f"{relative.stem}.png"
+    return Path(method) / relative.parent / name
+
+
+def parse_size(text: str):
+    """"FILASxCOLUMNAS" -> (filas, columnas); sirve como `type` de argparse"""
+    rows, sep, cols = text.lower().partition("x")
+    if not sep:
+        raise ValueError(f"Tamaño mal formado (usa FILASxCOLUMNAS): {text}")
+    return int(rows), int(cols)
+
+
+def best_time(function, *args, repeat: int = 1, setup=None):
+    """Mejor tiempo (s) de `repeat` llamadas a `function(*args)` y el resultado de la última
+
+    Con `setup`, cada repetición llama primero a `setup()` (fuera del tiempo
+    medido) y pasa su resultado como primer argumento; así cada medición
+    puede empezar con un objeto nuevo, sin cachés.
+    """
+    best, result = float("inf"), None
+    for _ in range(max(1, repeat)):
+        call_args = (setup(),) + args if setup is not None else args
+        start = time.perf_counter()
+        result = function(*call_args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
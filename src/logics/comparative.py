@@ -1,6 +1,6 @@
 import cv2 as cv
-import numpy as np
-from skimage.metrics import structural_similarity as ssim
+from logics.metrics import image_metrics, ssim
+from logics.tiled_metrics import DEFAULT_MEMORY_BUDGET_MB, open_image_rows, tiled_metrics
 import matplotlib.pyplot as plt
 from pathlib import Path
 import urllib.parse
@@ -39,6 +39,26 @@ class comparative:
         except Exception as e:
             raise ValueError(f"Error al cargar las imágenes: {str(e)}")
 
+    @classmethod
+    def metrics_from_files(cls, path_original: str, path_processed: str,
+                           memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB, **kwargs):
+        """Métricas de dos imágenes grandes sin cargarlas completas en memoria
+
+        Las imágenes se leen por franjas (.npy, .raw/.bin o TIFF sin compresión
+        se mapean en memoria; ver `logics.tiled_metrics`) y la memoria de
+        trabajo se mantiene por debajo de `memory_budget_mb`. `shape` y `dtype`
+        se pasan a `open_image_rows` para los archivos .raw; el resto de
+        `kwargs` a `tiled_metrics`.
+        """
+        open_kwargs = {key: kwargs.pop(key) for key in ("shape", "dtype") if key in kwargs}
+        original = open_image_rows(cls._clean_path(path_original), **open_kwargs)
+        processed = open_image_rows(cls._clean_path(path_processed), **open_kwargs)
+
+        metrics = tiled_metrics(original, processed, memory_budget_mb=memory_budget_mb, **kwargs)
+        metrics["dimensiones_original"] = original.shape
+        metrics["dimensiones_procesada"] = processed.shape
+        return metrics
+
     @staticmethod
     def _clean_path(path: str) -> str:
         """Limpia y normaliza rutas para Windows/Linux"""
@@ -66,11 +86,10 @@ class comparative:
         # SSIM (Structural Similarity Index)
         ssim_value = ssim(gray_original, gray_processed)
 
-        # PSNR (Peak Signal-to-Noise Ratio)
-        psnr_value = cv.PSNR(self.image_original, self.image_processed)
-
-        # MSE (Mean Squared Error)
-        mse_value = np.mean((self.image_original.astype(float) - self.image_processed.astype(float)) ** 2)
+        # PSNR (Peak Signal-to-Noise Ratio) y MSE (Mean Squared Error) en una sola pasada
+        quality = image_metrics(self.image_original, self.image_processed)
+        psnr_value = quality["psnr"]
+        mse_value = quality["mse"]
 
         # Crear gráfica comparativa
         fig, axes = plt.subplots(1, 3, figsize=(15, 5))
@@ -155,12 +174,15 @@ class comparative:
         """Retorna diccionario con todas las métricas"""
         gray_original = cv.cvtColor(self.image_original, cv.COLOR_BGR2GRAY)
         gray_processed = cv.cvtColor(self.image_processed, cv.COLOR_BGR2GRAY)
+        quality = image_metrics(self.image_original, self.image_processed)
 
         return {
             "ssim": float(ssim(gray_original, gray_processed)),
-            "psnr": float(cv.PSNR(self.image_original, self.image_processed)),
-            "mse": float(np.mean((self.image_original.astype(float) - self.image_processed.astype(float)) ** 2)),
-            "mae": float(np.mean(np.abs(self.image_original.astype(float) - self.image_processed.astype(float)))),
+            "psnr": quality["psnr"],
+            "mse": quality["mse"],
+            "mae": quality["mae"],
+            "correlacion": quality["correlacion"],
+            "diferencia_media_canal": quality["diferencia_media_canal"],
             "dimensiones_original": self.image_original.shape,
             "dimensiones_procesada": self.image_processed.shape
         }
@@ -0,0 +1,213 @@
+import os
+import time
+import numpy as np
+import cv2 as cv
+
+
+# Variables de entorno para configurar el backend sin tocar el código
+BACKEND_ENV = "FILTROS_FFT_BACKEND"
+WORKERS_ENV = "FILTROS_FFT_WORKERS"
+
+# Precisión de las transformadas -> tipo real (los espectros son el complejo correspondiente).
+# Para imágenes de 8 bits "float32" (complex64) sobra y mueve la mitad de memoria
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+
+
+class NumpyFFTBackend:
+    """FFT con `numpy.fft` (un solo hilo, siempre disponible)"""
+    name = "numpy"
+
+    def fft2(self, a, axes=(0, 1)):
+        return np.fft.fft2(a, axes=axes)
+
+    def ifft2(self, a, axes=(0, 1)):
+        return np.fft.ifft2(a, axes=axes)
+
+    def rfft2(self, a, axes=(0, 1)):
+        return np.fft.rfft2(a, axes=axes)
+
+    def irfft2(self, a, s, axes=(0, 1)):
+        return np.fft.irfft2(a, s=s, axes=axes)
+
+    def fast_length(self, n: int) -> int:
+        """Menor tamaño >= n para el que la transformada es rápida (producto de 2, 3 y 5)"""
+        return cv.getOptimalDFTSize(n)
+
+    def __str__(self):
+        return self.name
+
+
+class ScipyFFTBackend(NumpyFFTBackend):
+    """FFT con `scipy.fft`, repartiendo el trabajo en `workers` hilos"""
+    name = "scipy"
+
+    def __init__(self, workers: int = None):
+        # Importación diferida: scipy es opcional
+        import scipy.fft
+        self._fft = scipy.fft
+        self.workers = workers if workers is not None else _default_workers()
+
+    def fft2(self, a, axes=(0, 1)):
+        return self._fft.fft2(a, axes=axes, workers=self.workers)
+
+    def ifft2(self, a, axes=(0, 1)):
+        return self._fft.ifft2(a, axes=axes, workers=self.workers)
+
+    def rfft2(self, a, axes=(0, 1)):
+        return self._fft.rfft2(a, axes=axes, workers=self.workers)
+
+    def irfft2(self, a, s, axes=(0, 1)):
+        return self._fft.irfft2(a, s=s, axes=axes, workers=self.workers)
+
+    def fast_length(self, n: int) -> int:
+        return self._fft.next_fast_len(n, real=True)
+
+    def __str__(self):
+        return f"{self.name} (workers={self.workers})"
+
+
+class OpenCVFFTBackend(NumpyFFTBackend):
+    """FFT con `cv.dft` (usa los hilos internos de OpenCV)
+
+    `cv.dft` solo transforma planos 2D, así que los arreglos HxWxC se procesan
+    plano por plano. Solo se admiten los ejes (0, 1).
+    """
+    name = "opencv"
+
+    def fft2(self, a, axes=(0, 1)):
+        return self._per_plane(a, axes, self._fft2_plane)
+
+    def ifft2(self, a, axes=(0, 1)):
+        return self._per_plane(a, axes, self._ifft2_plane)
+
+    def rfft2(self, a, axes=(0, 1)):
+        return self._per_plane(a, axes, lambda p: self._fft2_plane(p)[:, :p.shape[1] // 2 + 1])
+
+    def irfft2(self, a, s, axes=(0, 1)):
+        return self._per_plane(a, axes, lambda p: self._irfft2_plane(p, s))
+
+    @staticmethod
+    def _per_plane(a, axes, plane_fn):
+        if tuple(axes) != (0, 1):
+            raise ValueError("El backend opencv solo transforma los ejes (0, 1)")
+        if a.ndim == 2:
+            return plane_fn(a)
+        return np.stack([plane_fn(a[:, :, k]) for k in range(a.shape[2])], axis=2)
+
+    @staticmethod
+    def _fft2_plane(p):
+        if np.iscomplexobj(p):
+            p = _to_cv_complex(p)
+        else:
+            p = np.ascontiguousarray(p, dtype=_cv_float(p.dtype))
+        return _from_cv_complex(cv.dft(p, flags=cv.DFT_COMPLEX_OUTPUT))
+
+    @staticmethod
+    def _ifft2_plane(p):
+        out = cv.dft(_to_cv_complex(p), flags=cv.DFT_INVERSE | cv.DFT_SCALE | cv.DFT_COMPLEX_OUTPUT)
+        return _from_cv_complex(out)
+
+    @staticmethod
+    def _irfft2_plane(p, s):
+        Nf, Nc = s
+        # cv.dft necesita el espectro completo: las columnas que faltan son el conjugado reflejado
+        mirrored = np.conj(p[(-np.arange(Nf)) % Nf, 1:Nc - Nc // 2][:, ::-1])
+        full = np.concatenate([p[:, :Nc // 2 + 1], mirrored], axis=1)
+        return cv.dft(_to_cv_complex(full), flags=cv.DFT_INVERSE | cv.DFT_SCALE | cv.DFT_REAL_OUTPUT)
+
+
+def _cv_float(dtype):
+    """cv.dft trabaja en float32 o float64"""
+    return np.float32 if dtype in (np.float32, np.complex64) else np.float64
+
+
+def _to_cv_complex(p):
+    """Complejo numpy -> arreglo de dos canales (real, imaginario) de OpenCV"""
+    real_dtype = _cv_float(p.dtype)
+    out = np.empty(p.shape + (2,), dtype=real_dtype)
+    out[..., 0] = p.real
+    out[..., 1] = p.imag
+    return out
+
+
+def _from_cv_complex(p):
+    """Arreglo de dos canales de OpenCV -> complejo numpy"""
+    return p[..., 0] + 1j * p[..., 1]
+
+
+def _default_workers():
+    workers = os.environ.get(WORKERS_ENV)
+    if workers:
+        return max(1, int(workers))
+    return os.cpu_count() or 1
+
+
+_BACKENDS = {
+    "numpy": NumpyFFTBackend,
+    "scipy": ScipyFFTBackend,
+    "opencv": OpenCVFFTBackend,
+}
+
+_auto_backends = {}  # Resultado del micro-benchmark por número de hilos (se mide una vez por proceso)
+
+
+def available_backends():
+    """Nombres de los backends que se pueden usar en este entorno"""
+    names = []
+    for name, backend_cls in _BACKENDS.items():
+        try:
+            backend_cls()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name: str = None, workers: int = None):
+    """Devuelve un backend FFT
+
+    `name` puede ser "numpy", "scipy", "opencv" o "auto". Si no se indica se usa
+    la variable de entorno FILTROS_FFT_BACKEND y, en su defecto, "auto", que
+    elige el más rápido con un micro-benchmark al primer uso (sin imprimir nada;
+    quien lo necesite reporta `get_backend().name`). Si `name` ya es un
+    backend, se devuelve tal cual.
+    """
+    if isinstance(name, NumpyFFTBackend):
+        return name
+    if name is None:
+        name = os.environ.get(BACKEND_ENV, "auto")
+    name = name.lower()
+
+    if name == "auto":
+        return _benchmark_backends(workers)
+
+    if name not in _BACKENDS:
+        raise ValueError(f"Backend FFT no soportado: {name} (usa uno de {tuple(_BACKENDS)} o 'auto')")
+
+    if name == "scipy":
+        return ScipyFFTBackend(workers)
+    return _BACKENDS[name]()
+
+
+def _benchmark_backends(workers: int = None, size: int = 1024, repeats: int = 3):
+    """Mide rfft2 + irfft2 en cada backend disponible y se queda con el más rápido"""
+    if workers in _auto_backends:
+        return _auto_backends[workers]
+
+    sample = np.random.default_rng(0).random((size, size))
+    best, best_time = None, float("inf")
+
+    for name in available_backends():
+        backend = get_backend(name, workers)
+        backend.irfft2(backend.rfft2(sample), s=sample.shape)  # Calentamiento
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            backend.irfft2(backend.rfft2(sample), s=sample.shape)
+        elapsed = (time.perf_counter() - start) / repeats
+
+        if elapsed < best_time:
+            best, best_time = backend, elapsed
+
+    _auto_backends[workers] = best
+    return best
@@ -2,16 +2,62 @@ import numpy as np
 import cv2 as cv
 from pathlib import Path
 import urllib.parse
+from logics.fft_backends import PRECISIONS, get_backend
+from logics.frequency_cache import _max_distance, frequency_grid, frequency_mask, half_plane_mask
+from logics.lazy import LazyDict, lazy
+from logics.metrics import image_metrics
+
+
+# Motores FFT disponibles:
+#   "rfft": transformadas real->complejo (medio espectro), ~mitad de memoria y tiempo
+#   "fft":  transformadas complejas completas (comportamiento original)
+FFT_ENGINES = ("rfft", "fft")
+
+# Relleno hasta un tamaño rápido de FFT (None: transformar el tamaño original)
+#   "reflect": refleja la imagen en el relleno (sin saltos en el borde)
+#   "zero":    rellena con ceros
+PADDING_MODES = (None, "reflect", "zero")
+
+# Canales que pasan por la FFT:
+#   "bgr":       cada canal B, G, R por separado (comportamiento original)
+#   "luminance": solo la luminancia (Y de YCrCb); el color (Cr, Cb) pasa sin cambios
+#   "gray":      solo la luminancia; el resultado es en escala de grises
+COLOR_MODES = ("bgr", "luminance", "gray")
+
+# Pasa bajas recortado (`crop=True`): la imagen reducida tiene CROP_OVERSAMPLING muestras por
+# cada una que exige la frecuencia de corte, y solo se usa si mide a lo más CROP_MAX_FRACTION
+# del espectro completo
+CROP_OVERSAMPLING = 2
+CROP_MAX_FRACTION = 0.5
+
+# Nombre de cada máscara en el análisis (tipos en logics.frequency_cache.MASK_TYPES)
+FILTER_NAMES = {
+    "lowpass": "pasa-bajas",
+    "highpass": "pasa-altas",
+    "bandpass": "pasa-banda",
+    "bandreject": "rechaza-banda",
+    "notch": "notch"
+}
 
 
 class filters:
     image_path: str = None
+    engine: str = "rfft"
+    backend = None  # Backend FFT (numpy, scipy u opencv), ver logics.fft_backends
+    _padding = None
+    _color_mode = "bgr"
+    _precision = "float64"
     _cached_image = None
+    _ycrcb_cache = None  # Imagen en YCrCb para los modos de luminancia
+    _spectrum_cache = None  # ✅ Espectros de la imagen, se calculan una sola vez
 
-    def __init__(self, image_path: str):
+    def __init__(self, image_path: str, engine: str = "rfft", backend: str = None, padding: str = None,
+                 color_mode: str = "bgr", precision: str = "float64"):
         if image_path is None:
             raise ValueError("Dime la dirección de la imagen")
 
+        self._configure(engine, backend, padding, color_mode, precision)
+
         # ✅ Limpiar y normalizar ruta
         clean_path = self._clean_path(image_path)
 
@@ -22,9 +68,30 @@ class filters:
 
         self.image_path = clean_path
         self.image = test_img  # Usar imagen ya cargada
-        self._cached_image = test_img
         print(f"Imagen cargada correctamente: {clean_path}")
 
+    @classmethod
+    def from_image(cls, image: np.ndarray, engine: str = "rfft", backend: str = None, padding: str = None,
+                   color_mode: str = "bgr", precision: str = "float64"):
+        """Crea una instancia a partir de una imagen ya cargada en memoria (sin leer de disco)"""
+        if image is None:
+            raise ValueError("Dime la imagen")
+
+        instance = cls.__new__(cls)
+        instance._configure(engine, backend, padding, color_mode, precision)
+        instance.image = image
+        return instance
+
+    def _configure(self, engine: str, backend, padding: str = None, color_mode: str = "bgr",
+                   precision: str = "float64"):
+        if engine not in FFT_ENGINES:
+            raise ValueError(f"Motor FFT no soportado: {engine} (usa uno de {FFT_ENGINES})")
+        self.engine = engine
+        self.backend = get_backend(backend)
+        self.padding = padding
+        self.color_mode = color_mode
+        self.precision = precision
+
     @staticmethod
     def _clean_path(path: str) -> str:
         """Limpia y normaliza rutas para Windows/Linux"""
@@ -43,9 +110,83 @@ class filters:
 
         return str(Path(path).resolve())
 
+    @property
+    def image(self):
+        return self._cached_image
+
+    @image.setter
+    def image(self, value):
+        # Si cambia la imagen, los espectros cacheados ya no son válidos
+        self._cached_image = value
+        self._ycrcb_cache = None
+        self._spectrum_cache = None
+
+    @property
+    def padding(self):
+        return self._padding
+
+    @padding.setter
+    def padding(self, value):
+        if value not in PADDING_MODES:
+            raise ValueError(f"Relleno no soportado: {value} (usa uno de {PADDING_MODES})")
+        # El espectro cacheado depende del tamaño de la transformada
+        self._padding = value
+        self._spectrum_cache = None
+
+    @property
+    def color_mode(self):
+        return self._color_mode
+
+    @color_mode.setter
+    def color_mode(self, value):
+        if value not in COLOR_MODES:
+            raise ValueError(f"Modo de color no soportado: {value} (usa uno de {COLOR_MODES})")
+        # El espectro cacheado depende de los canales que se transforman
+        self._color_mode = value
+        self._spectrum_cache = None
+
+    @property
+    def precision(self):
+        return self._precision
+
+    @precision.setter
+    def precision(self, value):
+        if value not in PRECISIONS:
+            raise ValueError(f"Precisión no soportada: {value} (usa una de {tuple(PRECISIONS)})")
+        # El espectro cacheado se calculó con la precisión anterior
+        self._precision = value
+        self._spectrum_cache = None
+
+    @property
+    def luminance(self):
+        """Luminancia (Y de YCrCb, igual que `cv.COLOR_BGR2GRAY`) de la imagen, calculada una sola vez"""
+        if self.image.ndim == 2:
+            return self.image
+        return self._ycrcb()[:, :, 0]
+
+    def with_luminance(self, plane: np.ndarray):
+        """Imagen en color con `plane` como luminancia y el color (Cr, Cb) de la original"""
+        if self.image.ndim == 2:
+            return plane
+        ycrcb = self._ycrcb().copy()
+        ycrcb[:, :, 0] = plane
+        result = cv.cvtColor(ycrcb, cv.COLOR_YCrCb2BGR)
+        if self.image.shape[2] == 4:
+            # El canal alfa no pasa por YCrCb
+            result = np.dstack([result, self.image[:, :, 3]])
+        return result
+
     # Métodos principales que retornan solo la imagen (para la UI)
-    def ffts_filter_lowpass(self, radio: float = 0.14):
-        """Filtro pasa bajas: suaviza la imagen, elimina ruido"""
+    def ffts_filter_lowpass(self, radio: float = 0.14, crop: bool = False):
+        """Filtro pasa bajas: suaviza la imagen, elimina ruido
+
+        Con `crop=True` y radios pequeños solo se invierte el bloque del espectro
+        que pasa la máscara (mucho más rápido, ver `lowpass_crop_error`).
+        """
+        if crop:
+            result = self._lowpass_cropped(radio)
+            if result is not None:
+                return result
         result, _, _ = self.ffts_filter_lowpass_detailed(radio)
         return result
 
@@ -61,107 +202,11 @@ class filters:
         Retorna:
             tuple: (imagen_filtrada, análisis_dict, visualizaciones_dict)
         """
-        Nf, Nc = self.image.shape[:2]
-
-        # Malla de frecuencias normalizadas
-        fx = np.arange(-Nc // 2, Nc // 2)
-        fy = np.arange(-Nf // 2, Nf // 2)
-        X, Y = np.meshgrid(fx, fy)
-        D = np.sqrt(X.astype(float) ** 2 + Y.astype(float) ** 2)
-        D = D / (D.max() if D.max() != 0 else 1.0)
-
-        # Máscara pasa bajas
-        mask = (D < radio).astype(np.float64)
-
-        # Procesar cada canal
-        channels = cv.split(self.image)
-        filtered_channels = []
-        all_analysis = []
-
-        for ch in channels:
-            img_filtered, analysis = self.__process_channels_fft_detailed(ch, mask, "lowpass", radio)
-            filtered_channels.append(img_filtered)
-            all_analysis.append(analysis)
-
-        filtered_image = cv.merge(filtered_channels)
-
-        # Calcular métricas globales
-        mse = np.mean((self.image.astype(float) - filtered_image.astype(float)) ** 2)
-        psnr = 20 * np.log10(255.0 / np.sqrt(mse)) if mse > 0 else float('inf')
-
-        total_freq = D.size
-        freq_passed = np.sum(mask)
-        freq_blocked = total_freq - freq_passed
-
-        analysis_dict = {
-            "mse": float(mse),
-            "psnr": float(psnr),
-            "radio_cutoff": radio,
-            "frecuencias_pasadas": int(freq_passed),
-            "frecuencias_bloqueadas": int(freq_blocked),
-            "porcentaje_pasado": float(freq_passed / total_freq * 100),
-            "tipo_filtro": "pasa-bajas",
-            "canales": all_analysis
-        }
-
-        visualizations_dict = {
-            "mask": mask,
-            "frequency_grid": D,
-            "espectro_original": all_analysis[0]["espectro_original"],
-            "espectro_filtrado": all_analysis[0]["espectro_filtrado"]
-        }
-
-        return filtered_image, analysis_dict, visualizations_dict
+        return self.__fft_filter_detailed(radio, "lowpass")
 
     def ffts_filter_highpass_detailed(self, radio: float = 0.14):
         """Filtro pasa altas con análisis completo"""
-        Nf, Nc = self.image.shape[:2]
-
-        fx = np.arange(-Nc // 2, Nc // 2)
-        fy = np.arange(-Nf // 2, Nf // 2)
-        X, Y = np.meshgrid(fx, fy)
-        D = np.sqrt(X.astype(float) ** 2 + Y.astype(float) ** 2)
-        D = D / (D.max() if D.max() != 0 else 1.0)
-
-        mask = (D >= radio).astype(np.float64)
-
-        channels = cv.split(self.image)
-        filtered_channels = []
-        all_analysis = []
-
-        for ch in channels:
-            img_filtered, analysis = self.__process_channels_fft_detailed(ch, mask, "highpass", radio)
-            filtered_channels.append(img_filtered)
-            all_analysis.append(analysis)
-
-        filtered_image = cv.merge(filtered_channels)
-
-        mse = np.mean((self.image.astype(float) - filtered_image.astype(float)) ** 2)
-        psnr = 20 * np.log10(255.0 / np.sqrt(mse)) if mse > 0 else float('inf')
-
-        total_freq = D.size
-        freq_passed = np.sum(mask)
-        freq_blocked = total_freq - freq_passed
-
-        analysis_dict = {
-            "mse": float(mse),
-            "psnr": float(psnr),
-            "radio_cutoff": radio,
-            "frecuencias_pasadas": int(freq_passed),
-            "frecuencias_bloqueadas": int(freq_blocked),
-            "porcentaje_pasado": float(freq_passed / total_freq * 100),
-            "tipo_filtro": "pasa-altas",
-            "canales": all_analysis
-        }
-
-        visualizations_dict = {
-            "mask": mask,
-            "frequency_grid": D,
-            "espectro_original": all_analysis[0]["espectro_original"],
-            "espectro_filtrado": all_analysis[0]["espectro_filtrado"]
-        }
-
-        return filtered_image, analysis_dict, visualizations_dict
+        return self.__fft_filter_detailed(radio, "highpass")
 
     def apply_median_filter(self, ksize: int = 5):
         """Filtro de Mediana: elimina ruido sal y pimienta"""
@@ -183,10 +228,11 @@ class filters:
 
     def compare_filters(self, radio: float = 0.14):
         """Compara filtro pasa-bajas vs pasa-altas"""
-        lowpass_img, lowpass_analysis, lowpass_viz = self.ffts_filter_lowpass_detailed(radio)
-        highpass_img, highpass_analysis, highpass_viz = self.ffts_filter_highpass_detailed(radio)
+        # Ambos filtros comparten la transformada directa y una sola inversa por lotes
+        (lowpass_img, lowpass_analysis, lowpass_viz), (highpass_img, highpass_analysis, highpass_viz) = \
+            self.filter_bank([("lowpass", radio), ("highpass", radio)])
 
-        original_sharpness = cv.Laplacian(self.image, cv.CV_64F).var()
+        original_sharpness = cv.Laplacian(self._reference_image(), cv.CV_64F).var()
         lowpass_sharpness = cv.Laplacian(lowpass_img, cv.CV_64F).var()
         highpass_sharpness = cv.Laplacian(highpass_img, cv.CV_64F).var()
 
@@ -215,52 +261,503 @@ class filters:
             }
         }
 
-    def __process_channels_fft_detailed(self, ch, mask, filter_type, cutoff_radius):
-        """Procesa un canal con FFT y retorna análisis detallado"""
-        ch_f = ch.astype(np.float64)
+    def lowpass_crop_error(self, radio: float = 0.14):
+        """Diferencia (niveles de gris) entre el pasa bajas recortado y el exacto"""
+        exact = self.ffts_filter_lowpass(radio)
+        cropped = self.ffts_filter_lowpass(radio, crop=True)
+        diff = cv.absdiff(exact, cropped)
+        return {
+            "diferencia_maxima": int(diff.max()),
+            "diferencia_media": float(diff.mean()),
+            "tamano_recortado": self._crop_shape(radio)
+        }
+
+    def radius_sweep(self, radios, filter_type: str = "lowpass"):
+        """Análisis de muchos radios de corte a la vez, sin aplicar ningún filtro
 
-        F = np.fft.fft2(ch_f)
-        Fshift = np.fft.fftshift(F)
+        Con máscaras ideales (0/1) la energía que pasa es la suma de |F|² dentro
+        (o fuera) del radio, y por Parseval el error del filtrado es la energía
+        que la máscara quita. Todo sale del perfil radial acumulado del espectro
+        en caché (se calcula una vez por imagen), así que cada radio es una
+        búsqueda binaria, sin transformadas inversas.
 
-        magnitude_spec_original = 20 * np.log10(np.abs(Fshift) + 1e-8)
+        El MSE/PSNR estimados son los del resultado antes de tomar el valor
+        absoluto, recortar a 0-255 y redondear (con `padding`, sobre la imagen
+        rellenada); para el pasa bajas quedan muy cerca de los de
+        `ffts_filter_lowpass_detailed`. La energía
+        retenida y los conteos de frecuencias coinciden con el análisis.
 
-        G_shift = Fshift * mask
+        Retorna:
+            dict de arreglos (uno por radio): radios, frecuencias_pasadas,
+            frecuencias_bloqueadas, porcentaje_pasado, energia_retenida_porcentaje,
+            energia_retenida_canal (radios x canales), mse_estimado y psnr_estimado
+        """
+        if filter_type not in ("lowpass", "highpass"):
+            raise ValueError(f"Tipo de filtro no soportado: {filter_type}")
+
+        radios = np.atleast_1d(np.asarray(radios, dtype=np.float64))
+        profile = self._forward_spectra()["perfil_radial"]
+
+        # El pasa bajas deja pasar D < radio: las primeras `idx` frecuencias del perfil ordenado
+        idx = np.searchsorted(profile["distancias"], radios, side="left")
+        energy = profile["energia_acumulada"][idx]
+        passed = profile["conteo_acumulado"][idx]
+        total_energy = profile["energia_acumulada"][-1]
+        total_freq = int(profile["conteo_acumulado"][-1])
+        if filter_type == "highpass":
+            energy = total_energy - energy
+            passed = total_freq - passed
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            retained_channel = np.where(total_energy > 0, energy / total_energy * 100, 0.0)
+            retained = energy.sum(axis=1) / total_energy.sum() * 100 if total_energy.sum() > 0 else np.zeros(len(radios))
+
+            # Parseval (FFT sin normalizar): sum|x - y|² = sum|F - G|² / N, y G = F·máscara
+            removed = np.maximum(total_energy - energy, 0.0).sum(axis=1)
+            mse = removed / total_freq / (total_freq * energy.shape[1])
+            psnr = np.where(mse > 0, 20 * np.log10(255.0 / np.sqrt(mse)), np.inf)
+
+        return {
+            "radios": radios,
+            "tipo_filtro": FILTER_NAMES[filter_type],
+            "frecuencias_pasadas": passed,
+            "frecuencias_bloqueadas": total_freq - passed,
+            "porcentaje_pasado": passed / total_freq * 100,
+            "energia_retenida_porcentaje": retained,
+            "energia_retenida_canal": retained_channel,
+            "mse_estimado": mse,
+            "psnr_estimado": psnr
+        }
 
-        magnitude_spec_filtered = 20 * np.log10(np.abs(G_shift) + 1e-8)
+    def filter_bank(self, specs):
+        """Aplica varias máscaras ideales con una sola transformada directa
 
-        G = np.fft.ifftshift(G_shift)
-        img_filtered = np.fft.ifft2(G)
-        img_filtered = np.abs(img_filtered)
-        img_filtered = np.clip(img_filtered, 0, 255).astype(np.uint8)
+        `specs` es una lista de máscaras, cada una un dict {"tipo", "radio",
+        "centros"} o una tupla (tipo, radio[, centros]):
+            ("lowpass", 0.14), ("highpass", 0.3)
+            ("bandpass", (0.1, 0.3)), ("bandreject", (0.1, 0.3))
+            ("notch", 0.02, [(40, 0), (0, 25)])  # centros en (columnas, filas) desde la DC
 
-        energy_original = np.sum(np.abs(Fshift) ** 2)
-        energy_filtered = np.sum(np.abs(G_shift) ** 2)
-        energy_retained = (energy_filtered / energy_original * 100) if energy_original > 0 else 0
+        El espectro en caché se multiplica por cada máscara y todas las inversas
+        (máscaras x canales) se hacen en una sola llamada al backend.
 
-        analysis = {
-            "espectro_original": magnitude_spec_original,
-            "espectro_filtrado": magnitude_spec_filtered,
-            "energia_original": float(energy_original),
-            "energia_filtrada": float(energy_filtered),
-            "energia_retenida_porcentaje": float(energy_retained),
-            "media_original": float(np.mean(ch)),
-            "media_filtrada": float(np.mean(img_filtered)),
-            "std_original": float(np.std(ch)),
-            "std_filtrada": float(np.std(img_filtered)),
-            "min_max_original": (float(np.min(ch)), float(np.max(ch))),
-            "min_max_filtrada": (float(np.min(img_filtered)), float(np.max(img_filtered)))
+        Retorna:
+            list: (imagen_filtrada, análisis_dict, visualizaciones_dict) por máscara
+        """
+        specs = [_mask_spec(spec) for spec in specs]
+        if not specs:
+            return []
+
+        Nf, Nc = self.image.shape[:2]
+        Pf, Pc = self._fft_shape()
+
+        # El espectro de la imagen ya está en caché
+        spectrum = self._forward_spectra()
+        F = spectrum["F"]
+        C = F.shape[2]
+
+        # Máscaras en la precisión del espectro: multiplicar no promueve complex64 a complex128
+        dtype = PRECISIONS[self.precision]
+        if self.engine == "rfft":
+            # Mitad del plano sin desplazar: columnas con frecuencia 0..Nc//2.
+            # Las máscaras salen de una caché LRU compartida, no se recalculan por llamada
+            masks = [half_plane_mask(Pf, Pc, radio, filter_type, centers, dtype)
+                     for filter_type, radio, centers in specs]
+        else:
+            masks = [frequency_mask(Pf, Pc, radio, filter_type, False, centers, dtype)
+                     for filter_type, radio, centers in specs]
+
+        # Todas las máscaras apiladas en el eje de canales: una sola inversa para el lote
+        G = np.empty(F.shape[:2] + (C * len(specs),), dtype=F.dtype)
+        for k, mask in enumerate(masks):
+            np.multiply(F, mask[:, :, np.newaxis], out=G[:, :, k * C:(k + 1) * C])
+
+        if self.engine == "rfft":
+            filtered = self.backend.irfft2(G, s=(Pf, Pc))[:Nf, :Nc]
+        else:
+            filtered = self.backend.ifft2(np.fft.ifftshift(G, axes=(0, 1)))[:Nf, :Nc]
+        del G
+
+        filtered = np.clip(np.abs(filtered), 0, 255).astype(np.uint8)
+
+        results = []
+        for k, ((filter_type, radio, centers), mask) in enumerate(zip(specs, masks)):
+            filtered_planes = np.ascontiguousarray(filtered[:, :, k * C:(k + 1) * C])
+            filtered_image = self._compose(filtered_planes)
+            analysis_dict, visualizations_dict = self._lazy_analysis(radio, filter_type, centers, spectrum, mask,
+                                                                     filtered_planes, filtered_image)
+            results.append((filtered_image, analysis_dict, visualizations_dict))
+        return results
+
+    def __fft_filter_detailed(self, radio, filter_type):
+        """Aplica la máscara ideal `filter_type` a todos los canales a la vez
+
+        Los canales se transforman juntos sobre los ejes (0, 1) del arreglo HxWxC y
+        la máscara se aplica por broadcasting: sin `cv.split`/`cv.merge` ni copias
+        por canal. Con `padding` la transformada (y con ella la máscara, los
+        espectros y la energía) tiene el tamaño rápido y el resultado se recorta
+        al tamaño original.
+
+        Solo el filtrado se hace aquí; el análisis y las visualizaciones son
+        LazyDict que calculan cada valor la primera vez que se pide.
+        """
+        return self.filter_bank([(filter_type, radio)])[0]
+
+    def _lazy_analysis(self, radio, filter_type, centers, spectrum, engine_mask, filtered_planes, filtered_image):
+        """Análisis y visualizaciones de un filtrado, calculados al pedirlos
+
+        Todo lo que usan se captura aquí (imagen, espectro, tamaños, motor), así
+        siguen siendo válidos aunque después cambie la imagen de la instancia.
+        Las métricas globales comparan la imagen resultante; las de cada canal,
+        los planos que pasaron por la FFT (solo la luminancia en esos modos).
+        """
+        original = self._reference_image()
+        image = self._fft_planes()
+        filtered_3d = filtered_planes
+        Pf, Pc = self._fft_shape()
+        Nf, Nc = original.shape[:2]
+        engine = self.engine
+        centered = engine == "rfft"
+        dtype = PRECISIONS[self.precision]
+
+        def energy_filtered():
+            # La máscara es 0/1: la energía de F·máscara sale de F sin guardar el espectro filtrado
+            weights = engine_mask
+            if engine == "rfft":
+                weights = (engine_mask * self._half_spectrum_weights(Pc)[np.newaxis, :]).astype(dtype)
+            power = np.abs(spectrum["F"]) ** 2
+            power *= weights[:, :, np.newaxis]
+            return np.sum(power, axis=(0, 1), dtype=np.float64)
+
+        # Valores que comparten varias entradas (malla y máscara centradas, para visualización)
+        shared = LazyDict({
+            "D": lazy(lambda: frequency_grid(Pf, Pc, centered)),
+            "mask": lazy(lambda: frequency_mask(Pf, Pc, radio, filter_type, centered, centers)),
+            "pasadas": lazy(lambda: int(np.sum(shared["mask"]))),
+            "energia_filtrada": lazy(energy_filtered),
+            # Métricas globales en una sola pasada sobre ambas imágenes
+            "calidad": lazy(lambda: image_metrics(original, filtered_image)),
+        })
+
+        def channel_analysis(c):
+            ch = image[:, :, c]
+            ch_filtered = filtered_3d[:, :, c]
+
+            def energy_retained():
+                energy_original = spectrum["energia"][c]
+                return float(shared["energia_filtrada"][c] / energy_original * 100) if energy_original > 0 else 0
+
+            return LazyDict({
+                "espectro_original": lazy(lambda: spectrum["magnitud"][:, :, c]),
+                # Donde la máscara es 0 el espectro filtrado vale 20*log10(1e-8)
+                "espectro_filtrado": lazy(lambda: np.where(shared["mask"] > 0, spectrum["magnitud"][:, :, c],
+                                                           20 * np.log10(1e-8))),
+                "energia_original": lazy(lambda: float(spectrum["energia"][c])),
+                "energia_filtrada": lazy(lambda: float(shared["energia_filtrada"][c])),
+                "energia_retenida_porcentaje": lazy(energy_retained),
+                "media_original": lazy(lambda: float(np.mean(ch))),
+                "media_filtrada": lazy(lambda: float(np.mean(ch_filtered))),
+                "std_original": lazy(lambda: float(np.std(ch, dtype=dtype))),
+                "std_filtrada": lazy(lambda: float(np.std(ch_filtered, dtype=dtype))),
+                "min_max_original": lazy(lambda: (float(np.min(ch)), float(np.max(ch)))),
+                "min_max_filtrada": lazy(lambda: (float(np.min(ch_filtered)), float(np.max(ch_filtered))))
+            })
+
+        channels = LazyDict({c: lazy(lambda c=c: channel_analysis(c)) for c in range(image.shape[2])})
+        total_freq = Pf * Pc
+
+        analysis_dict = LazyDict({
+            "mse": lazy(lambda: shared["calidad"]["mse"]),
+            "psnr": lazy(lambda: shared["calidad"]["psnr"]),
+            "radio_cutoff": radio,
+            "frecuencias_pasadas": lazy(lambda: shared["pasadas"]),
+            "frecuencias_bloqueadas": lazy(lambda: total_freq - shared["pasadas"]),
+            "porcentaje_pasado": lazy(lambda: float(shared["pasadas"] / total_freq * 100)),
+            "tipo_filtro": FILTER_NAMES[filter_type],
+            "motor_fft": engine,
+            "backend_fft": str(self.backend),
+            "tamano_imagen": (Nf, Nc),
+            "tamano_fft": (Pf, Pc),
+            "relleno": self.padding or "ninguno",
+            "modo_color": self.color_mode,
+            "precision": self.precision,
+            "canales": lazy(lambda: [channels[c] for c in range(len(channels))])
+        })
+
+        visualizations_dict = LazyDict({
+            "mask": lazy(lambda: shared["mask"]),
+            "frequency_grid": lazy(lambda: shared["D"]),
+            "espectro_original": lazy(lambda: channels[0]["espectro_original"]),
+            "espectro_filtrado": lazy(lambda: channels[0]["espectro_filtrado"])
+        })
+
+        return analysis_dict, visualizations_dict
+
+    def _crop_shape(self, radio):
+        """Tamaño reducido (filas, columnas) del pasa bajas recortado, o None si no compensa"""
+        if self.engine != "rfft":
+            return None
+
+        Pf, Pc = self._fft_shape()
+        if Pf < 2 or Pc < 2:
+            # Una sola fila o columna: no hay nada que recortar en ese eje
+            return None
+        d_max = _max_distance(Pf, Pc)
+        # Frecuencia más alta (en índices) que cumple D < radio
+        k = int(np.ceil(radio * d_max)) - 1
+        if k < 0:
+            return None
+
+        def reduced(P):
+            if 2 * k + 1 >= P:
+                return P
+            return min(P, self.backend.fast_length(int(np.ceil(CROP_OVERSAMPLING * (2 * k + 1)))))
+
+        Mf, Mc = reduced(Pf), reduced(Pc)
+        if Mf * Mc > CROP_MAX_FRACTION * Pf * Pc:
+            return None
+        return Mf, Mc
+
+    def _lowpass_cropped(self, radio):
+        """Pasa bajas invirtiendo solo el bloque del espectro que sobrevive a la máscara
+
+        Las frecuencias que pasan caben en una imagen de `_crop_shape`; se
+        invierte esa imagen reducida y se amplía con interpolación cúbica al
+        tamaño original. El desfase de medio píxel de `cv.resize` se corrige
+        antes con una fase en el espectro, y los bordes (donde `cv.resize`
+        repite píxeles) se rehacen dando la vuelta a la imagen, como la FFT.
+        Frente a la inversa completa difiere en unos pocos niveles de gris.
+
+        Retorna None si el recorte no compensa (radio grande o motor "fft").
+        """
+        shape = self._crop_shape(radio)
+        if shape is None:
+            return None
+
+        Mf, Mc = shape
+        Nf, Nc = self.image.shape[:2]
+        Pf, Pc = self._fft_shape()
+        F = self._forward_spectra()["F"]
+        mask = half_plane_mask(Pf, Pc, radio, "lowpass", dtype=PRECISIONS[self.precision])
+
+        # Filas con frecuencia 0..k arriba y -k..-1 abajo; columnas 0..k (medio espectro)
+        rows = np.arange(Pf) if Mf == Pf else np.r_[0:Mf // 2, Pf - (Mf - Mf // 2):Pf]
+        cols = min(Mc // 2 + 1, Pc // 2 + 1)
+        S = np.zeros((Mf, Mc // 2 + 1, F.shape[2]), dtype=F.dtype)
+        S[:, :cols] = F[rows, :cols] * mask[rows, :cols, np.newaxis]
+
+        # cv.resize toma la muestra de (x + 0.5)·escala - 0.5; se adelanta la imagen reducida
+        # para que tome la de x·escala (la de la FFT completa)
+        shift_f = 0.5 * (1 - Mf / Pf)
+        shift_c = 0.5 * (1 - Mc / Pc)
+        phase_f = np.exp(2j * np.pi * np.fft.fftfreq(Mf) * shift_f)
+        phase_c = np.exp(2j * np.pi * np.arange(Mc // 2 + 1) / Mc * shift_c)
+        S *= (phase_f[:, np.newaxis] * phase_c[np.newaxis, :])[:, :, np.newaxis]
+
+        # irfft2 normaliza por el tamaño reducido: se reescala al del espectro completo
+        small = self.backend.irfft2(S, s=(Mf, Mc)) * (Mf * Mc / (Pf * Pc))
+        small = small.astype(np.float32)
+        if small.shape[2] == 1:
+            small = small[:, :, 0]
+
+        upsampled = cv.resize(small, (Pc, Pf), interpolation=cv.INTER_CUBIC)
+        _wrap_borders(upsampled, small, (shift_f, shift_c))
+
+        # |x| recortado a 0-255 y truncado, igual que np.clip(np.abs(x)).astype(np.uint8)
+        filtered = cv.convertScaleAbs(upsampled[:Nf, :Nc], alpha=1, beta=-0.5)
+        if filtered.ndim == 2:
+            filtered = filtered[:, :, np.newaxis]
+        return self._compose(filtered)
+
+    def _ycrcb(self):
+        if self._ycrcb_cache is None:
+            self._ycrcb_cache = cv.cvtColor(np.ascontiguousarray(self.image[:, :, :3]), cv.COLOR_BGR2YCrCb)
+        return self._ycrcb_cache
+
+    def _fft_planes(self):
+        """Planos que pasan por la FFT como arreglo HxWxC (C = 1 en gris y en los modos de luminancia)"""
+        if self.image.ndim == 2 or self.color_mode != "bgr":
+            return self.luminance[:, :, np.newaxis]
+        return self.image
+
+    def _compose(self, filtered_planes):
+        """Imagen resultante a partir de los planos filtrados (HxWxC uint8)"""
+        if self.image.ndim == 2 or self.color_mode == "gray":
+            return filtered_planes[:, :, 0]
+        if self.color_mode == "luminance":
+            return self.with_luminance(filtered_planes[:, :, 0])
+        return filtered_planes
+
+    def _reference_image(self):
+        """Imagen contra la que se comparan los resultados (la luminancia en modo "gray")"""
+        return self.luminance if self.color_mode == "gray" else self.image
+
+    def _fft_shape(self):
+        """Tamaño (filas, columnas) de la transformada: el de la imagen o el rápido más cercano"""
+        Nf, Nc = self.image.shape[:2]
+        if self.padding is None:
+            return Nf, Nc
+        return self.backend.fast_length(Nf), self.backend.fast_length(Nc)
+
+    def _fft_input(self):
+        """Imagen HxWxC en la precisión de la instancia, rellenada abajo y a la derecha hasta `_fft_shape`"""
+        image = self._fft_planes().astype(PRECISIONS[self.precision])
+        Nf, Nc = image.shape[:2]
+        Pf, Pc = self._fft_shape()
+        if (Pf, Pc) == (Nf, Nc):
+            return image
+
+        pad_width = ((0, Pf - Nf), (0, Pc - Nc), (0, 0))
+        if self.padding == "reflect":
+            return np.pad(image, pad_width, mode="reflect")
+        return np.pad(image, pad_width, mode="constant")
+
+    def _forward_spectra(self):
+        """Espectro de todos los canales, calculado una sola vez por imagen
+
+        Retorna un LazyDict con "F" (HxW'xC: medio espectro sin desplazar para
+        "rfft", espectro completo centrado para "fft"); "magnitud" (log-magnitud
+        HxWxC del plano completo centrado) y "energia" (energía espectral por
+        canal) solo se calculan si el análisis los pide.
+        """
+        if self._spectrum_cache is None:
+            image = self._fft_input()
+            if self.engine == "rfft":
+                spectrum = self._half_spectrum(image)
+            else:
+                spectrum = self._full_spectrum(image)
+            self._spectrum_cache = spectrum
+        return self._spectrum_cache
+
+    def _full_spectrum(self, image):
+        """FFT directa centrada de todos los canales junto con su log-magnitud y energía"""
+        Fshift = _read_only(np.fft.fftshift(self.backend.fft2(image), axes=(0, 1)))
+
+        Nf, Nc = image.shape[:2]
+
+        return LazyDict({
+            "F": Fshift,
+            "magnitud": lazy(lambda: _read_only(20 * np.log10(np.abs(Fshift) + 1e-8))),
+            # Las sumas de energía se acumulan en float64 aunque el espectro sea complex64
+            "energia": lazy(lambda: np.sum(np.abs(Fshift) ** 2, axis=(0, 1), dtype=np.float64)),
+            # Misma malla con la que se construye la máscara del motor "fft"
+            "perfil_radial": lazy(lambda: self._radial_profile(frequency_grid(Nf, Nc, centered=False), Fshift,
+                                                               np.ones(Nc, dtype=np.int64)))
+        })
+
+    def _half_spectrum(self, image):
+        """FFT real de todos los canales (medio espectro, sin desplazar)
+
+        La log-magnitud se reconstruye al plano completo y centrado por simetría
+        hermitiana, para que las visualizaciones sean iguales a las del motor "fft".
+        """
+        Nf, Nc = image.shape[:2]
+        F = _read_only(self.backend.rfft2(image))
+
+        def magnitude():
+            magnitude_half = 20 * np.log10(np.abs(F) + 1e-8)
+            # |F(u, v)| = |F(-u, -v)|: las columnas que faltan son el reflejo de las existentes
+            mirrored = magnitude_half[(-np.arange(Nf)) % Nf, 1:Nc - Nc // 2][:, ::-1]
+            return _read_only(np.fft.fftshift(np.concatenate([magnitude_half, mirrored], axis=1), axes=(0, 1)))
+
+        def energy():
+            weights = self._half_spectrum_weights(Nc)[np.newaxis, :, np.newaxis]
+            power = np.abs(F) ** 2
+            power *= weights
+            return np.sum(power, axis=(0, 1), dtype=np.float64)
+
+        def radial_profile():
+            # Distancias del medio plano en el orden de `half_plane_mask`
+            D = np.fft.ifftshift(frequency_grid(Nf, Nc, centered=True))[:, :Nc // 2 + 1]
+            return self._radial_profile(D, F, self._half_spectrum_weights(Nc).astype(np.int64))
+
+        return LazyDict({
+            "F": F,
+            "magnitud": lazy(magnitude),
+            "energia": lazy(energy),
+            "perfil_radial": lazy(radial_profile)
+        })
+
+    @staticmethod
+    def _radial_profile(D, F, column_weights):
+        """Frecuencias ordenadas por distancia con su conteo y energía por canal acumulados
+
+        `column_weights` es cuántas frecuencias representa cada columna de F
+        (2 para las del medio espectro con pareja conjugada). Los acumulados
+        empiezan en 0: el índice i da el total de las i frecuencias más cercanas.
+        """
+        order = np.argsort(D, axis=None, kind="stable")
+        weights = np.broadcast_to(column_weights[np.newaxis, :], D.shape).ravel()[order]
+
+        # Canal por canal para no copiar el espectro complejo completo
+        energy = np.zeros((len(order) + 1, F.shape[2]))
+        for c in range(F.shape[2]):
+            power = np.abs(F[:, :, c]).ravel()[order] ** 2
+            power *= weights
+            np.cumsum(power, dtype=np.float64, out=energy[1:, c])
+        count = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(weights, out=count[1:])
+
+        return {
+            "distancias": D.ravel()[order],
+            "conteo_acumulado": count,
+            "energia_acumulada": energy
         }
 
-        return img_filtered, analysis
+    @staticmethod
+    def _half_spectrum_weights(Nc):
+        """Peso de cada columna del medio espectro al sumar energía (Parseval)
 
-    def __process_channels_fft(self, ch, mask):
-        """Versión simplificada para compatibilidad"""
-        img_filtered, analysis = self.__process_channels_fft_detailed(ch, mask, "generic", 0.0)
-        return img_filtered, analysis["espectro_original"]
+        Las columnas con pareja conjugada fuera del medio plano cuentan doble;
+        la columna 0 y, si Nc es par, la de Nyquist cuentan una sola vez.
+        """
+        weights = np.full(Nc // 2 + 1, 2.0)
+        weights[0] = 1.0
+        if Nc % 2 == 0:
+            weights[-1] = 1.0
+        return weights
 
     def __str__(self):
         return f"Filtros aplicados a {self.image_path}"
 
     def __del__(self):
         if hasattr(super(), '__del__'):
-            super().__del__()
\ No newline at end of file
+            super().__del__()
+
+
+def _wrap_borders(upsampled, small, shift):
+    """Rehace con borde circular las franjas de `cv.resize` que leen fuera de `small`
+
+    La interpolación cúbica usa 2 vecinos a cada lado: las primeras y últimas
+    ~2/escala filas y columnas se recalculan con `cv.warpAffine` y BORDER_WRAP.
+    """
+    Pf, Pc = upsampled.shape[:2]
+    Mf, Mc = small.shape[:2]
+    scale_f, scale_c = Mf / Pf, Mc / Pc
+    band_f = min(Pf // 2, int(np.ceil(2 / scale_f)) + 1)
+    band_c = min(Pc // 2, int(np.ceil(2 / scale_c)) + 1)
+
+    def redo(top, left, height, width):
+        M = np.float64([[scale_c, 0, scale_c * left - shift[1]], [0, scale_f, scale_f * top - shift[0]]])
+        strip = cv.warpAffine(small, M, (width, height), flags=cv.INTER_CUBIC | cv.WARP_INVERSE_MAP,
+                              borderMode=cv.BORDER_WRAP)
+        upsampled[top:top + height, left:left + width] = strip.reshape(upsampled[top:top + height, left:left + width].shape)
+
+    redo(0, 0, band_f, Pc)
+    redo(Pf - band_f, 0, band_f, Pc)
+    redo(0, 0, Pf, band_c)
+    redo(0, Pc - band_c, Pf, band_c)
+
+
+def _mask_spec(spec):
+    """(tipo, radio, centros) de una máscara del banco, dada como dict o tupla"""
+    if isinstance(spec, dict):
+        return spec["tipo"], spec["radio"], tuple(spec.get("centros", ()))
+    filter_type, radio, *centers = spec
+    return filter_type, radio, tuple(centers[0]) if centers else ()
+
+
+def _read_only(array):
+    """Marca el arreglo como de solo lectura: el análisis devuelve referencias a él"""
+    array.flags.writeable = False
+    return array
@@ -0,0 +1,172 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+# Presupuesto de memoria de la caché de mallas/máscaras (MB)
+CACHE_BUDGET_ENV = "FILTROS_MASK_CACHE_MB"
+DEFAULT_CACHE_BUDGET_MB = 512
+
+# Máscaras ideales disponibles
+MASK_TYPES = ("lowpass", "highpass", "bandpass", "bandreject", "notch")
+
+
+class ArrayLRUCache:
+    """Caché LRU de arreglos numpy acotada por bytes (no por número de entradas)
+
+    Los arreglos se guardan como solo lectura porque se comparten entre todas
+    las instancias de `filters`. Un arreglo más grande que el presupuesto no se
+    guarda.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+
+        value = compute()
+        value.flags.writeable = False
+
+        with self._lock:
+            if key not in self._items and value.nbytes <= self.max_bytes:
+                self._items[key] = value
+                self._bytes += value.nbytes
+                # Desalojar las entradas menos usadas hasta volver al presupuesto
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._items.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._items)
+
+
+def _budget_from_env():
+    budget_mb = os.environ.get(CACHE_BUDGET_ENV)
+    return int(float(budget_mb) * 1024 * 1024) if budget_mb else DEFAULT_CACHE_BUDGET_MB * 1024 * 1024
+
+
+# Caché compartida por todas las instancias de `filters` del proceso
+_cache = ArrayLRUCache(_budget_from_env())
+
+
+def frequency_grid(Nf: int, Nc: int, centered: bool = True):
+    """Distancia normalizada al origen en el plano de frecuencias desplazado
+
+    Con `centered=True` cada índice corresponde a su frecuencia real (k - N//2,
+    la convención de `fftshift`), así la máscara es simétrica y sirve para el
+    medio espectro de `rfft2`. Con `centered=False` se usa la malla original
+    (`arange(-N//2, N//2)`), que para tamaños impares queda corrida un índice.
+    El radio se normaliza siempre con la misma distancia máxima.
+    """
+    return _cache.get_or_compute(("grid", Nf, Nc, centered), lambda: _compute_grid(Nf, Nc, centered))
+
+
+def frequency_mask(Nf: int, Nc: int, radio, filter_type: str, centered: bool = True, centers=(),
+                   dtype=np.float64):
+    """Máscara ideal (0/1, en `dtype`) centrada de `filter_type` (ver MASK_TYPES)
+
+    `radio` es un número para "lowpass", "highpass" y "notch", y un par
+    (interior, exterior) para "bandpass" y "bandreject". Los `centers` del
+    "notch" son desplazamientos (columnas, filas) desde la frecuencia 0; cada
+    uno se rechaza junto con su simétrico para que el resultado sea real.
+    """
+    radio, centers = _mask_key(radio, filter_type, centers)
+    key = ("mask", Nf, Nc, radio, filter_type, centered, centers, np.dtype(dtype).name)
+    return _cache.get_or_compute(
+        key, lambda: _compute_mask(Nf, Nc, centered, radio, filter_type, centers).astype(dtype, copy=False)
+    )
+
+
+def half_plane_mask(Nf: int, Nc: int, radio, filter_type: str, centers=(), dtype=np.float64):
+    """Máscara para el medio espectro de `rfft2` (sin desplazar, columnas 0..Nc//2)"""
+    radio, centers = _mask_key(radio, filter_type, centers)
+    key = ("half_mask", Nf, Nc, radio, filter_type, centers, np.dtype(dtype).name)
+    return _cache.get_or_compute(
+        key, lambda: np.fft.ifftshift(
+            frequency_mask(Nf, Nc, radio, filter_type, True, centers, dtype))[:, :Nc // 2 + 1].copy()
+    )
+
+
+def clear_cache():
+    """Vacía la caché de mallas y máscaras"""
+    _cache.clear()
+
+
+def _frequency_axes(Nf, Nc, centered):
+    if centered:
+        return np.arange(Nc) - Nc // 2, np.arange(Nf) - Nf // 2
+    return np.arange(-Nc // 2, Nc // 2), np.arange(-Nf // 2, Nf // 2)
+
+
+def _max_distance(Nf, Nc):
+    d_max = np.hypot(-(-Nc // 2), -(-Nf // 2))
+    return d_max if d_max != 0 else 1.0
+
+
+def _compute_grid(Nf, Nc, centered):
+    fx, fy = _frequency_axes(Nf, Nc, centered)
+    X, Y = np.meshgrid(fx, fy)
+    D = np.sqrt(X.astype(float) ** 2 + Y.astype(float) ** 2)
+    return D / _max_distance(Nf, Nc)
+
+
+def _mask_key(radio, filter_type, centers):
+    """Normaliza los parámetros de la máscara (también sirven de clave de la caché)"""
+    if filter_type not in MASK_TYPES:
+        raise ValueError(f"Tipo de filtro no soportado: {filter_type}")
+    if filter_type in ("bandpass", "bandreject"):
+        try:
+            inner, outer = (float(r) for r in radio)
+        except (TypeError, ValueError):
+            raise ValueError("bandpass/bandreject necesitan (radio_interior, radio_exterior)") from None
+        if inner > outer:
+            raise ValueError(f"El radio interior debe ser menor que el exterior: {radio}")
+        radio = (inner, outer)
+    else:
+        radio = float(radio)
+    if filter_type == "notch":
+        centers = tuple((int(u), int(v)) for u, v in centers)
+        if not centers:
+            raise ValueError("El filtro notch necesita al menos un centro")
+    else:
+        centers = ()
+    return radio, centers
+
+
+def _compute_mask(Nf, Nc, centered, radio, filter_type, centers):
+    if filter_type == "notch":
+        fx, fy = _frequency_axes(Nf, Nc, centered)
+        fx, fy = fx[np.newaxis, :].astype(float), fy[:, np.newaxis].astype(float)
+        d_max = _max_distance(Nf, Nc)
+        keep = np.ones((Nf, Nc), dtype=bool)
+        for u, v in centers:
+            for su, sv in ((u, v), (-u, -v)):
+                keep &= np.hypot(fx - su, fy - sv) / d_max >= radio
+        return keep.astype(np.float64)
+
+    D = frequency_grid(Nf, Nc, centered)
+    if filter_type == "lowpass":
+        return (D < radio).astype(np.float64)
+    if filter_type == "highpass":
+        return (D >= radio).astype(np.float64)
+    inner, outer = radio
+    band = (D >= inner) & (D < outer)
+    return (band if filter_type == "bandpass" else ~band).astype(np.float64)
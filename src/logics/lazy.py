@@ -0,0 +1,39 @@
+from collections.abc import Mapping
+
+
+class lazy:
+    """Valor de un LazyDict que se calcula con `fn()` la primera vez que se pide"""
+    __slots__ = ("fn",)
+
+    def __init__(self, fn):
+        self.fn = fn
+
+
+class LazyDict(Mapping):
+    """Diccionario de solo lectura con valores perezosos
+
+    Los valores envueltos en `lazy` se calculan al primer acceso y se guardan;
+    el resto se devuelve tal cual. Se usa como un dict normal (`d["mse"]`,
+    `d.get(...)`, `in`, iteración); `dict(d)` calcula todo.
+    """
+
+    def __init__(self, entries: dict):
+        self._entries = dict(entries)
+
+    def __getitem__(self, key):
+        value = self._entries[key]
+        if isinstance(value, lazy):
+            value = value.fn()
+            self._entries[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        items = ", ".join(f"{key!r}: {'<pendiente>' if isinstance(value, lazy) else value!r}"
+                          for key, value in self._entries.items())
+        return f"LazyDict({{{items}}})"
@@ -0,0 +1,252 @@
+import numpy as np
+import cv2 as cv
+from logics.fft_backends import PRECISIONS
+
+
+# Elementos (píxeles x canales) por bloque de filas en el recorrido de las imágenes
+CHUNK_ELEMENTS = 1 << 16
+
+
+def image_metrics(image_a: np.ndarray, image_b: np.ndarray, data_range: float = 255.0,
+                  chunk_elements: int = CHUNK_ELEMENTS, precision: str = "float64") -> dict:
+    """MSE, PSNR, MAE, correlación de Pearson y diferencia media por canal en una sola pasada
+
+    Las imágenes se recorren por bloques de filas y de cada bloque salen todas
+    las sumas a la vez, sin copias float64 de las imágenes completas. Cada
+    bloque se convierte a float64 y se centra en `data_range / 2`; con imágenes
+    de 8 bits las sumas de productos son exactas, así que la correlación no
+    pierde precisión aunque esté muy cerca de 1. Con `precision="float32"` los
+    bloques se convierten a float32 (la mitad de memoria por bloque; las sumas
+    siguen acumulándose en float64), a cambio de un error relativo del orden
+    de 1e-5 en correlaciones cercanas a 1.
+
+    Retorna:
+        dict: mse, psnr, mae, correlacion y diferencia_media_canal (media de A
+        menos media de B, una por canal)
+    """
+    accumulator = MetricsAccumulator(data_range, chunk_elements, precision)
+    accumulator.update(image_a, image_b)
+    return accumulator.result()
+
+
+class MetricsAccumulator:
+    """Sumas de `image_metrics` acumuladas por franjas de filas
+
+    Cada `update` recibe las mismas filas de ambas imágenes (2D o HxWxC); al
+    final `result` da las métricas de la imagen completa. Sirve para imágenes
+    que se leen por partes y no caben enteras en memoria.
+    """
+
+    def __init__(self, data_range: float = 255.0, chunk_elements: int = CHUNK_ELEMENTS,
+                 precision: str = "float64"):
+        self.data_range = data_range
+        self.chunk_elements = chunk_elements
+        self.dtype = _precision_dtype(precision)
+        self.count = 0
+        # Sumas: canal de A, canal de B, A², B², A·B, (A-B)², |A-B| (valores centrados)
+        self._sum_a = None
+        self._sum_b = None
+        self._sum_aa = self._sum_bb = self._sum_ab = self._sum_dd = self._sum_abs = 0.0
+
+    def update(self, rows_a: np.ndarray, rows_b: np.ndarray):
+        if rows_a.shape != rows_b.shape:
+            raise ValueError(f"Las imágenes tienen diferentes dimensiones: {rows_a.shape} vs {rows_b.shape}")
+        if rows_a.size == 0:
+            return
+
+        channels = 1 if rows_a.ndim == 2 else int(np.prod(rows_a.shape[2:]))
+        if self._sum_a is None:
+            self._sum_a = np.zeros(channels)
+            self._sum_b = np.zeros(channels)
+        elif self._sum_a.size != channels:
+            raise ValueError("Todas las franjas deben tener el mismo número de canales")
+
+        rows = rows_a.shape[0]
+        row_size = rows_a.size // rows
+        width = row_size // channels
+        offset = self.data_range / 2.0
+
+        flat_a = rows_a.reshape(rows, row_size)
+        flat_b = rows_b.reshape(rows, row_size)
+        rows_per_chunk = max(1, self.chunk_elements // row_size)
+        ones = np.ones(rows_per_chunk * width, dtype=self.dtype)
+
+        for start in range(0, rows, rows_per_chunk):
+            x = flat_a[start:start + rows_per_chunk].astype(self.dtype).ravel()
+            y = flat_b[start:start + rows_per_chunk].astype(self.dtype).ravel()
+            x -= offset
+            y -= offset
+
+            # Sumas por canal con un producto matriz-vector (mucho más rápido que sum(axis=0))
+            pixels = x.size // channels
+            self._sum_a += ones[:pixels] @ x.reshape(pixels, channels)
+            self._sum_b += ones[:pixels] @ y.reshape(pixels, channels)
+            self._sum_aa += float(np.dot(x, x))
+            self._sum_bb += float(np.dot(y, y))
+            self._sum_ab += float(np.dot(x, y))
+
+            x -= y  # x pasa a ser la diferencia A - B
+            self._sum_dd += float(np.dot(x, x))
+            np.abs(x, out=x)
+            self._sum_abs += float(x.sum())
+
+        self.count += rows_a.size
+
+    def result(self) -> dict:
+        if self.count == 0:
+            raise ValueError("Las imágenes están vacías")
+
+        n = self.count
+        mse = self._sum_dd / n
+        psnr = 20 * np.log10(self.data_range / np.sqrt(mse)) if mse > 0 else float('inf')
+
+        # Pearson sobre todos los valores (como np.corrcoef de las imágenes aplanadas)
+        mean_a = self._sum_a.sum() / n
+        mean_b = self._sum_b.sum() / n
+        cov = self._sum_ab / n - mean_a * mean_b
+        var_a = self._sum_aa / n - mean_a ** 2
+        var_b = self._sum_bb / n - mean_b ** 2
+        correlation = cov / np.sqrt(var_a * var_b) if var_a > 0 and var_b > 0 else float('nan')
+
+        pixels_per_channel = n // self._sum_a.size
+        return {
+            "mse": float(mse),
+            "psnr": float(psnr),
+            "mae": float(self._sum_abs / n),
+            "correlacion": float(np.clip(correlation, -1.0, 1.0)),
+            "diferencia_media_canal": ((self._sum_a - self._sum_b) / pixels_per_channel).tolist()
+        }
+
+
+# Constantes de estabilidad de SSIM (Wang et al., 2004)
+SSIM_K1 = 0.01
+SSIM_K2 = 0.03
+# Pesos por escala de MS-SSIM (Wang et al., 2003)
+MS_SSIM_WEIGHTS = (0.0448, 0.2856, 0.3001, 0.2363, 0.1333)
+
+
+def ssim(image_a: np.ndarray, image_b: np.ndarray, data_range: float = 255.0, win_size: int = None,
+         gaussian_weights: bool = False, use_sample_covariance: bool = True, per_channel: bool = False,
+         full: bool = False, precision: str = "float32"):
+    """SSIM con filtros separables de OpenCV en float32 (o float64 con `precision`)
+
+    Mismos valores por defecto que `skimage.metrics.structural_similarity`:
+    ventana uniforme de 7x7 con covarianza muestral, o gaussiana de sigma 1.5
+    (11x11) con `gaussian_weights=True`. Las imágenes HxWxC se comparan canal
+    por canal y se promedian (como `channel_axis=-1`).
+
+    Retorna:
+        float, o la lista por canal con `per_channel=True`. Con `full=True`
+        retorna (valor, mapa_ssim).
+    """
+    if image_a.shape != image_b.shape:
+        raise ValueError(f"Las imágenes tienen diferentes dimensiones: {image_a.shape} vs {image_b.shape}")
+
+    win_size = _ssim_win_size(win_size, gaussian_weights)
+    if win_size > min(image_a.shape[:2]):
+        raise ValueError(f"win_size={win_size} es mayor que la imagen {image_a.shape[:2]}")
+
+    dtype = _precision_dtype(precision)
+    planes_a, planes_b = _ssim_planes(image_a, dtype), _ssim_planes(image_b, dtype)
+    pad = (win_size - 1) // 2
+    values, maps = [], []
+    for x, y in zip(planes_a, planes_b):
+        ssim_map, _ = _ssim_maps(x, y, data_range, win_size, gaussian_weights, use_sample_covariance)
+        # Como skimage: se descarta el borde donde la ventana sale de la imagen
+        values.append(float(ssim_map[pad:ssim_map.shape[0] - pad, pad:ssim_map.shape[1] - pad].mean(dtype=np.float64)))
+        maps.append(ssim_map)
+
+    value = values if per_channel else float(np.mean(values))
+    if not full:
+        return value
+    return value, maps[0] if image_a.ndim == 2 else np.stack(maps, axis=2)
+
+
+def ms_ssim(image_a: np.ndarray, image_b: np.ndarray, data_range: float = 255.0, win_size: int = None,
+            gaussian_weights: bool = True, weights=MS_SSIM_WEIGHTS, per_channel: bool = False,
+            precision: str = "float32"):
+    """SSIM multiescala (MS-SSIM)
+
+    En cada escala se mide contraste-estructura y la imagen se reduce a la
+    mitad (promedio 2x2); la luminancia solo cuenta en la escala más gruesa.
+    La imagen debe medir al menos `win_size * 2**(escalas-1)` de lado.
+    """
+    if image_a.shape != image_b.shape:
+        raise ValueError(f"Las imágenes tienen diferentes dimensiones: {image_a.shape} vs {image_b.shape}")
+
+    win_size = _ssim_win_size(win_size, gaussian_weights)
+    min_side = win_size * 2 ** (len(weights) - 1)
+    if min(image_a.shape[:2]) < min_side:
+        raise ValueError(f"MS-SSIM con {len(weights)} escalas necesita imágenes de al menos {min_side}px de lado")
+
+    dtype = _precision_dtype(precision)
+    weights = np.asarray(weights, dtype=np.float64)
+    pad = (win_size - 1) // 2
+    values = []
+    for x, y in zip(_ssim_planes(image_a, dtype), _ssim_planes(image_b, dtype)):
+        scale_values = []
+        for level in range(len(weights)):
+            ssim_map, cs_map = _ssim_maps(x, y, data_range, win_size, gaussian_weights, False)
+            crop = (slice(pad, x.shape[0] - pad), slice(pad, x.shape[1] - pad))
+            last = level == len(weights) - 1
+            scale_values.append(float((ssim_map if last else cs_map)[crop].mean(dtype=np.float64)))
+            if not last:
+                x = cv.resize(x, (x.shape[1] // 2, x.shape[0] // 2), interpolation=cv.INTER_AREA)
+                y = cv.resize(y, (y.shape[1] // 2, y.shape[0] // 2), interpolation=cv.INTER_AREA)
+
+        # Valores negativos (estructura invertida) no tienen potencia real
+        values.append(float(np.prod(np.maximum(scale_values, 0.0) ** weights)))
+
+    return values if per_channel else float(np.mean(values))
+
+
+def _precision_dtype(precision):
+    if precision not in PRECISIONS:
+        raise ValueError(f"Precisión no soportada: {precision} (usa una de {tuple(PRECISIONS)})")
+    return PRECISIONS[precision]
+
+
+def _ssim_win_size(win_size, gaussian_weights):
+    if win_size is None:
+        # skimage: 7 con ventana uniforme; 11 (sigma 1.5 truncada a 3.5 sigmas) con gaussiana
+        return 11 if gaussian_weights else 7
+    if win_size < 3 or win_size % 2 == 0:
+        raise ValueError("win_size debe ser impar y >= 3")
+    return win_size
+
+
+def _ssim_planes(image, dtype=np.float32):
+    """Planos float32 (o `dtype`) de una imagen 2D o HxWxC"""
+    if image.ndim == 2:
+        return [image.astype(dtype)]
+    return [image[:, :, k].astype(dtype) for k in range(image.shape[2])]
+
+
+def _ssim_maps(x, y, data_range, win_size, gaussian_weights, use_sample_covariance):
+    """Mapas de SSIM y de contraste-estructura de dos planos float32 o float64 (en su misma precisión)"""
+    depth = cv.CV_64F if x.dtype == np.float64 else cv.CV_32F
+    if gaussian_weights:
+        kernel = cv.getGaussianKernel(win_size, 1.5, depth)
+
+        def local_mean(p):
+            return cv.sepFilter2D(p, depth, kernel, kernel, borderType=cv.BORDER_REFLECT)
+    else:
+        def local_mean(p):
+            return cv.boxFilter(p, depth, (win_size, win_size), normalize=True, borderType=cv.BORDER_REFLECT)
+
+    n = win_size ** 2
+    cov_norm = n / (n - 1) if use_sample_covariance else 1.0
+    c1 = (SSIM_K1 * data_range) ** 2
+    c2 = (SSIM_K2 * data_range) ** 2
+
+    ux, uy = local_mean(x), local_mean(y)
+    ux_uy = ux * uy
+    ux_sq = ux * ux
+    uy_sq = uy * uy
+    vx = cov_norm * (local_mean(x * x) - ux_sq)
+    vy = cov_norm * (local_mean(y * y) - uy_sq)
+    vxy = cov_norm * (local_mean(x * y) - ux_uy)
+
+    cs_map = (2 * vxy + c2) / (vx + vy + c2)
+    ssim_map = (2 * ux_uy + c1) / (ux_sq + uy_sq + c1) * cs_map
+    return ssim_map, cs_map
@@ -1,18 +1,40 @@
 import cv2 as cv
 import numpy as np
-import random as rd
 from pathlib import Path
 import urllib.parse
 
 
+def spawn_rngs(seed, n: int):
+    """Crea `n` generadores independientes derivados de `seed`
+
+    Útil para repartir la síntesis de ruido entre procesos: cada trabajador
+    recibe su propio flujo y no comparte estado con los demás.
+    """
+    return [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(n)]
+
+
+def stream_for(seed, *key: int):
+    """Generador determinista para el elemento identificado por `key`
+
+    Equivale al hijo `key` de `SeedSequence(seed).spawn(...)`, pero no depende
+    de cuántos trabajadores haya ni del orden en que procesen: la misma
+    (semilla, clave) produce siempre los mismos números.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=tuple(int(k) for k in key)))
+
+
 class GenerateNoise:
     img_path: str = None
+    rng = None  # Generador por defecto de la instancia
     _cached_image = None  # ✅ Cachear imagen para no recargar
 
-    def __init__(self, image_path: str):
+    def __init__(self, image_path: str, seed=None):
         if image_path is None:
             raise ValueError("Dime la dirección de la imagen")
 
+        # ✅ Semilla (int, SeedSequence) o Generator; None = entropía del sistema
+        self.rng = np.random.default_rng(seed)
+
         # ✅ Limpiar y normalizar ruta
         clean_path = self._clean_path(image_path)
 
@@ -54,8 +76,23 @@ class GenerateNoise:
             raise ValueError(f"Error al leer imagen: {self.img_path}")
         return img
 
-    def impulsive_noise(self, noise_percentage=0):
-        """Ruido sal y pimienta"""
+    def _resolve_rng(self, rng):
+        """Generador a usar: el de la llamada si se indica, si no el de la instancia
+
+        Todos los métodos de ruido aceptan `rng` como semilla (int),
+        `SeedSequence` o `numpy.random.Generator`.
+        """
+        if rng is None:
+            return self.rng
+        return np.random.default_rng(rng)
+
+    def impulsive_noise(self, noise_percentage=0, exact: bool = False, rng=None):
+        """Ruido sal y pimienta
+
+        Todas las coordenadas se muestrean de una vez (sin bucles por pixel).
+        Con `exact=True` se muestrean sin reemplazo, así ningún pixel se repite y
+        la densidad resultante es exactamente la pedida.
+        """
         if noise_percentage <= 0 or noise_percentage > 100:
             print("Porcentaje inválido")
             return self._load_image()  # ✅ Retornar imagen original
@@ -64,51 +101,58 @@ class GenerateNoise:
         self.size_img = image.shape[0] * image.shape[1]
         self.noise_percentage_to_use = (noise_percentage * self.size_img) / 200
 
-        if image.shape[2] > 1:
+        if image.ndim == 3 and image.shape[2] > 1:
             self.pepper = [0, 0, 0]
             self.salt = [255, 255, 255]
         else:
             self.pepper = 0
             self.salt = 255
 
+        # Se deja un margen de 2 pixeles en cada borde
+        rows, cols = image.shape[0] - 4, image.shape[1] - 4
+        n_pixels = int(self.noise_percentage_to_use)
+        rng = self._resolve_rng(rng)
+
+        if exact:
+            n_pixels = min(n_pixels, (rows * cols) // 2)
+            positions = rng.choice(rows * cols, size=2 * n_pixels, replace=False)
+            salt_positions, pepper_positions = positions[:n_pixels], positions[n_pixels:]
+        else:
+            salt_positions = rng.integers(0, rows * cols, size=n_pixels)
+            pepper_positions = rng.integers(0, rows * cols, size=n_pixels)
+
         # Pixeles blancos
-        for x in range(int(self.noise_percentage_to_use)):
-            position_x = rd.randrange(2, image.shape[0] - 2)
-            position_y = rd.randrange(2, image.shape[1] - 2)
-            image[position_x][position_y] = self.salt
+        position_x, position_y = np.divmod(salt_positions, cols)
+        image[position_x + 2, position_y + 2] = self.salt
 
         # Pixeles negros
-        for x in range(int(self.noise_percentage_to_use)):
-            position_x = rd.randrange(2, image.shape[0] - 2)
-            position_y = rd.randrange(2, image.shape[1] - 2)
-            image[position_x][position_y] = self.pepper
+        position_x, position_y = np.divmod(pepper_positions, cols)
+        image[position_x + 2, position_y + 2] = self.pepper
 
         return image
 
-    def guassiano_noise(self, standard_deviation=1):
+    def guassiano_noise(self, standard_deviation=1, rng=None):
         """Ruido Gaussiano"""
         image = self._load_image()
         self.std_dev = standard_deviation
-        dist_nor = np.random.normal(0, self.std_dev, size=image.shape[0:2])
-
-        for i in range(dist_nor.shape[0]):
-            for j in range(dist_nor.shape[1]):
-                dist_nor[i][j] = int(round(((dist_nor[i][j]) * self.std_dev) + 127))
+        rng = self._resolve_rng(rng)
+        dist_nor = rng.normal(0, self.std_dev, size=image.shape[0:2])
 
+        # Nivel de gris de cada pixel ruidoso (misma escala y redondeo que antes)
+        dist_nor = np.round(dist_nor * self.std_dev + 127)
         dist_nor = np.array(dist_nor, dtype=np.uint8)
 
-        for i in range(dist_nor.shape[0]):
-            for j in range(dist_nor.shape[1]):
-                for k in range(image.shape[2]):
-                    if dist_nor[i][j] == 127:
-                        continue
-                    else:
-                        image[i][j][k] = dist_nor[i][j]
+        # Los pixeles con nivel 127 conservan su valor; el resto toma el nivel en todos los canales
+        noisy = dist_nor != 127
+        if image.ndim == 3:
+            image[noisy] = dist_nor[noisy][:, np.newaxis]
+        else:
+            image[noisy] = dist_nor[noisy]
 
         return image
 
-    def periodic_noise(self, frequency=30, amplitude=50):
-        """Ruido Periódico"""
+    def periodic_noise(self, frequency=30, amplitude=50, rng=None):
+        """Ruido Periódico (determinista: `rng` se acepta solo por uniformidad)"""
         image = self._load_image()
         rows, cols = image.shape[:2]
 
@@ -124,11 +168,11 @@ class GenerateNoise:
         noisy_image = np.clip(image.astype(np.int16) + pattern.astype(np.int16), 0, 255).astype(np.uint8)
         return noisy_image
 
-    def poisson_noise(self):
+    def poisson_noise(self, rng=None):
         """Ruido Poisson"""
         image = self._load_image()
         normalized = image / 255.0
-        noisy = np.random.poisson(normalized * 255.0) / 255.0
+        noisy = self._resolve_rng(rng).poisson(normalized * 255.0) / 255.0
         noisy_image = np.clip(noisy * 255, 0, 255).astype(np.uint8)
         return noisy_image
 
@@ -0,0 +1,148 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from logics.fft_backends import PRECISIONS, get_backend
+from logics.frequency_cache import _max_distance
+
+
+# Lado de cada mosaico de salida (sin contar el halo del kernel)
+DEFAULT_TILE_SIZE = 1024
+# Límites del lado del kernel espacial cuando se elige automáticamente
+MIN_KERNEL_SIZE = 31
+MAX_KERNEL_SIZE = 511
+# Lado de la malla de frecuencias con la que se diseña el kernel, en múltiplos de K
+GRID_OVERSAMPLING = 4
+# Fracción del kernel que la ventana de Tukey suaviza en los bordes
+WINDOW_TAPER = 0.1
+
+
+def ideal_kernel(image_shape, radio: float, filter_type: str, kernel_size: int = None) -> np.ndarray:
+    """Kernel espacial (KxK) que aproxima la máscara ideal de `filters` para una imagen de `image_shape`
+
+    La máscara usa la misma normalización que `frequency_grid` (el radio se
+    mide contra la esquina del espectro de la imagen completa), pero muestreada
+    en frecuencias continuas; su transformada inversa se recorta a KxK con una
+    ventana de Tukey que solo suaviza los bordes del kernel (recortar sin más
+    es lo más fiel al filtro ideal, pero deja un escalón en el borde). El pasa
+    altas es un impulso menos el pasa bajas (máscaras complementarias).
+    """
+    if filter_type not in ("lowpass", "highpass"):
+        raise ValueError(f"Tipo de filtro no soportado: {filter_type}")
+
+    Nf, Nc = image_shape[:2]
+    d_max = _max_distance(Nf, Nc)  # la misma normalización que las máscaras de `filters`
+    if kernel_size is None:
+        kernel_size = auto_kernel_size(image_shape, radio)
+    if kernel_size < 3 or kernel_size % 2 == 0:
+        raise ValueError("kernel_size debe ser impar y >= 3")
+
+    # Malla fina para que el recorte a KxK no arrastre aliasing de la malla; la
+    # máscara es simétrica, basta el medio plano de irfft2
+    grid = 1 << int(np.ceil(np.log2(max(GRID_OVERSAMPLING * kernel_size, 512))))
+    fy = np.fft.fftfreq(grid)[:, None]  # ciclos por píxel
+    fx = np.fft.rfftfreq(grid)[None, :]
+    mask = np.hypot(fx * Nc, fy * Nf) / d_max < radio
+
+    spatial = np.fft.fftshift(np.fft.irfft2(mask, s=(grid, grid)))
+    r = kernel_size // 2
+    center = grid // 2
+    kernel = spatial[center - r:center + r + 1, center - r:center + r + 1]
+
+    window = _tukey_window(kernel_size, WINDOW_TAPER)
+    kernel = kernel * np.outer(window, window)
+    # La ventana cambia la ganancia en DC: se restituye la de la máscara (1 si pasa la DC)
+    dc_gain = float(mask[0, 0])
+    kernel = kernel * (dc_gain / kernel.sum()) if kernel.sum() != 0 else kernel
+
+    if filter_type == "highpass":
+        kernel = -kernel
+        kernel[r, r] += 1.0
+    return kernel
+
+
+def auto_kernel_size(image_shape, radio: float) -> int:
+    """Lado del kernel: unas 16 longitudes de onda de la frecuencia de corte más baja
+
+    El kernel ideal decae lento (como una sinc), así que más lado es más
+    fidelidad; a partir de MAX_KERNEL_SIZE conviene la FFT completa.
+    """
+    Nf, Nc = image_shape[:2]
+    d_max = _max_distance(Nf, Nc)
+    cutoff = radio * d_max / max(Nf, Nc)  # ciclos por píxel en el eje más largo
+    size = int(np.ceil(16 / cutoff)) if cutoff > 0 else MAX_KERNEL_SIZE
+    size = min(MAX_KERNEL_SIZE, max(MIN_KERNEL_SIZE, size))
+    return size if size % 2 == 1 else size + 1
+
+
+def _tukey_window(size, taper):
+    """Ventana plana con bordes de coseno que ocupan `taper` del total"""
+    window = np.ones(size)
+    edge = int(taper * size / 2)
+    if edge > 0:
+        ramp = 0.5 * (1 - np.cos(np.pi * (np.arange(edge) + 1) / (edge + 1)))
+        window[:edge] = ramp
+        window[-edge:] = ramp[::-1]
+    return window
+
+
+def tiled_fft_filter(image: np.ndarray, radio: float, filter_type: str = "lowpass", kernel_size: int = None,
+                     tile_size: int = DEFAULT_TILE_SIZE, workers: int = None, backend=None,
+                     out: np.ndarray = None, precision: str = "float64") -> np.ndarray:
+    """Filtro ideal de Fourier por mosaicos con overlap-save
+
+    La imagen (2D o HxWxC, también un memmap) se recorre en mosaicos de
+    `tile_size`; cada uno se lee con un halo de `kernel_size // 2` píxeles,
+    se convoluciona con el kernel de `ideal_kernel` vía FFT y se guarda solo la
+    parte válida. Los bordes se leen dando la vuelta a la imagen, igual que la
+    FFT completa (convolución circular). La memoria depende del mosaico, no de
+    la imagen, y los mosaicos se reparten en `workers` hilos.
+
+    Retorna la imagen filtrada en uint8 (|resultado| recortado a 0-255, como
+    `filters`); con `out` se escribe ahí (puede ser un memmap). Con
+    `precision="float32"` los mosaicos se transforman en float32/complex64.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Precisión no soportada: {precision} (usa una de {tuple(PRECISIONS)})")
+    dtype = PRECISIONS[precision]
+    height, width = image.shape[:2]
+    kernel = ideal_kernel(image.shape, radio, filter_type, kernel_size)
+    r = kernel.shape[0] // 2
+
+    # Un solo hilo de FFT por mosaico: el paralelismo está en los mosaicos
+    backend = get_backend(backend, 1)
+    workers = workers or os.cpu_count() or 1
+
+    # El bloque (mosaico + halo) se lleva a un tamaño rápido de FFT; el mosaico crece con él
+    block = backend.fast_length(tile_size + 2 * r)
+    tile_size = block - 2 * r
+
+    # Kernel centrado en el origen (con vuelta) y transformado una sola vez
+    kernel_padded = np.zeros((block, block), dtype=dtype)
+    kernel_padded[np.ix_(np.arange(-r, r + 1) % block, np.arange(-r, r + 1) % block)] = kernel
+    kernel_spectrum = backend.rfft2(kernel_padded)
+    if image.ndim == 3:
+        kernel_spectrum = kernel_spectrum[:, :, None]
+
+    if out is None:
+        out = np.empty(image.shape, dtype=np.uint8)
+
+    def filter_tile(origin):
+        top, left = origin
+        rows = np.arange(top - r, top - r + block) % height
+        cols = np.arange(left - r, left - r + block) % width
+        tile = image[np.ix_(rows, cols)].astype(dtype)
+
+        spectrum = backend.rfft2(tile, axes=(0, 1)) * kernel_spectrum
+        filtered = backend.irfft2(spectrum, s=(block, block), axes=(0, 1))
+
+        # Overlap-save: solo el centro del bloque está libre de la vuelta circular
+        tile_h = min(tile_size, height - top)
+        tile_w = min(tile_size, width - left)
+        valid = filtered[r:r + tile_h, r:r + tile_w]
+        out[top:top + tile_h, left:left + tile_w] = np.clip(np.abs(valid), 0, 255).astype(np.uint8)
+
+    origins = [(top, left) for top in range(0, height, tile_size) for left in range(0, width, tile_size)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() propaga la primera excepción de los hilos
+        list(pool.map(filter_tile, origins))
+    return out
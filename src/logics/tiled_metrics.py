@@ -0,0 +1,166 @@
+import numpy as np
+import cv2 as cv
+from pathlib import Path
+from logics.metrics import MetricsAccumulator, _precision_dtype, _ssim_maps, _ssim_win_size
+
+
+# Memoria de trabajo por defecto para recorrer las imágenes por franjas (MB)
+DEFAULT_MEMORY_BUDGET_MB = 256
+# Planos de trabajo que SSIM mantiene vivos a la vez por cada plano de entrada
+_SSIM_WORK_PLANES = 16
+
+
+def open_image_rows(path: str, shape: tuple = None, dtype=np.uint8):
+    """Abre una imagen para leerla por franjas de filas sin decodificarla completa
+
+    - .npy: memoria mapeada
+    - .raw / .bin: memoria mapeada, hay que indicar `shape` (H, W[, C]) y `dtype`
+    - .tif / .tiff sin compresión: memoria mapeada con tifffile (si está instalado)
+    - cualquier otro formato: se decodifica completo con OpenCV
+
+    Retorna un arreglo que se rebana por filas; en los casos mapeados solo se
+    leen del disco las filas que se piden. Las imágenes de 3 canales quedan en
+    orden BGR, como con `cv.imread`.
+    """
+    path = str(path)
+    suffix = Path(path).suffix.lower()
+
+    if suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+
+    if suffix in (".raw", ".bin"):
+        if shape is None:
+            raise ValueError(f"Indica shape (H, W[, C]) para leer {path}")
+        return np.memmap(path, dtype=dtype, mode="r", shape=tuple(shape))
+
+    if suffix in (".tif", ".tiff"):
+        image = _memmap_tiff(path)
+        if image is not None:
+            return image
+        print(f"⚠️ {path} está comprimido o no se puede mapear: se decodifica completo")
+
+    image = cv.imread(path, cv.IMREAD_UNCHANGED)
+    if image is None:
+        raise ValueError(f"No se puede leer la imagen: {path}")
+    return image
+
+
+def _memmap_tiff(path):
+    try:
+        import tifffile  # Opcional
+    except ImportError:
+        return None
+
+    try:
+        image = tifffile.memmap(path, mode="r")
+    except ValueError:
+        return None
+
+    # tifffile entrega RGB; una vista con los canales invertidos da BGR sin copiar
+    if image.ndim == 3 and image.shape[2] == 3:
+        image = image[:, :, ::-1]
+    return image
+
+
+def tiled_metrics(image_a, image_b, data_range: float = 255.0, memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+                  compute_ssim: bool = True, ssim_per_channel: bool = False, win_size: int = None,
+                  gaussian_weights: bool = False, histograms: bool = True, precision: str = None) -> dict:
+    """Métricas de la imagen completa recorriendo ambas imágenes por franjas de filas
+
+    Acepta arreglos normales o mapeados (ver `open_image_rows`); de cada uno
+    solo se materializa una franja a la vez, con un alto que se elige para no
+    pasar de `memory_budget_mb`. MSE, PSNR, MAE, correlación, diferencia por
+    canal e histogramas se acumulan franja a franja. SSIM se calcula sobre la
+    franja más un halo de `win_size // 2` filas arriba y abajo, así el mapa es
+    idéntico al de la imagen completa.
+
+    SSIM se mide en escala de grises (como `comparative`) o canal por canal
+    con `ssim_per_channel=True`.
+
+    Sin `precision` cada métrica usa su valor por defecto (sumas en float64 como
+    `image_metrics`, SSIM en float32 como `ssim`); "float32" o "float64" fija
+    ambas.
+    """
+    if image_a.shape != image_b.shape:
+        raise ValueError(f"Las imágenes tienen diferentes dimensiones: {image_a.shape} vs {image_b.shape}")
+
+    height, width = image_a.shape[:2]
+    channels = 1 if image_a.ndim == 2 else image_a.shape[2]
+    win_size = _ssim_win_size(win_size, gaussian_weights)
+    pad = (win_size - 1) // 2
+    if compute_ssim and win_size > min(height, width):
+        raise ValueError(f"win_size={win_size} es mayor que la imagen {(height, width)}")
+
+    ssim_dtype = _precision_dtype(precision or "float32")
+    itemsize = max(image_a.dtype.itemsize, image_b.dtype.itemsize)
+    strip_rows = _strip_rows(width, channels, itemsize, memory_budget_mb, pad if compute_ssim else 0,
+                             np.dtype(ssim_dtype).itemsize)
+    histograms = histograms and image_a.dtype == np.uint8 and image_b.dtype == np.uint8
+
+    accumulator = MetricsAccumulator(data_range, precision=precision or "float64")
+    hist_a = np.zeros((channels, 256))
+    hist_b = np.zeros((channels, 256))
+    ssim_planes = channels if ssim_per_channel else 1
+    ssim_sums = np.zeros(ssim_planes)
+    ssim_count = 0
+
+    for top in range(0, height, strip_rows):
+        bottom = min(height, top + strip_rows)
+        # Filas de la franja más el halo que necesita la ventana de SSIM
+        halo_top = max(0, top - pad) if compute_ssim else top
+        halo_bottom = min(height, bottom + pad) if compute_ssim else bottom
+        strip_a = np.asarray(image_a[halo_top:halo_bottom])
+        strip_b = np.asarray(image_b[halo_top:halo_bottom])
+        core = slice(top - halo_top, bottom - halo_top)
+
+        accumulator.update(strip_a[core], strip_b[core])
+
+        if histograms:
+            core_a = np.ascontiguousarray(strip_a[core])
+            core_b = np.ascontiguousarray(strip_b[core])
+            for k in range(channels):
+                hist_a[k] += cv.calcHist([core_a], [k], None, [256], [0, 256]).ravel()
+                hist_b[k] += cv.calcHist([core_b], [k], None, [256], [0, 256]).ravel()
+
+        if compute_ssim:
+            # Como skimage: solo cuentan las posiciones donde la ventana cabe en la imagen
+            first = max(top, pad) - halo_top
+            last = min(bottom, height - pad) - halo_top
+            if last > first:
+                for k, (x, y) in enumerate(zip(_ssim_inputs(strip_a, ssim_per_channel, ssim_dtype),
+                                               _ssim_inputs(strip_b, ssim_per_channel, ssim_dtype))):
+                    ssim_map, _ = _ssim_maps(x, y, data_range, win_size, gaussian_weights, True)
+                    ssim_sums[k] += float(ssim_map[first:last, pad:width - pad].sum(dtype=np.float64))
+                ssim_count += (last - first) * (width - 2 * pad)
+
+    result = accumulator.result()
+    if compute_ssim:
+        per_channel = (ssim_sums / ssim_count).tolist()
+        result["ssim"] = per_channel if ssim_per_channel else per_channel[0]
+    if histograms:
+        result["histograma_a"] = hist_a.tolist()
+        result["histograma_b"] = hist_b.tolist()
+    result["filas_por_franja"] = strip_rows
+    return result
+
+
+def _strip_rows(width, channels, itemsize, memory_budget_mb, pad, work_itemsize=4):
+    """Alto de franja que cabe en el presupuesto (franjas de ambas imágenes + trabajo de SSIM)"""
+    source_row = 2 * width * channels * itemsize
+    work_row = width * work_itemsize * (_SSIM_WORK_PLANES + 2 * channels)
+    budget = memory_budget_mb * 1024 * 1024
+    rows = int(budget // (source_row + work_row)) - 2 * pad
+    if rows < 1:
+        raise ValueError(f"Presupuesto de memoria insuficiente para filas de {width} píxeles: {memory_budget_mb} MB")
+    return rows
+
+
+def _ssim_inputs(strip, per_channel, dtype=np.float32):
+    """Planos float32 (o `dtype`) de la franja para SSIM (gris o uno por canal)"""
+    if strip.ndim == 2:
+        return [strip.astype(dtype)]
+    if per_channel:
+        return [strip[:, :, k].astype(dtype) for k in range(strip.shape[2])]
+
+    code = cv.COLOR_BGRA2GRAY if strip.shape[2] == 4 else cv.COLOR_BGR2GRAY
+    return [cv.cvtColor(np.ascontiguousarray(strip), code).astype(dtype)]
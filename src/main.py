@@ -7,12 +7,16 @@ from controllers.filter_controller import FilterController
 from controllers.fourier_controller import FourierController
 from controllers.noise_controller import NoiseController
 from controllers.comparative_controller import ComparativeController
+from controllers.image_provider import PROVIDER_ID, result_images
 
 
 if __name__ == "__main__":
     app = QGuiApplication(sys.argv)
     engine = QQmlApplicationEngine()
 
+    # Resultados servidos desde memoria (image://results/...), sin PNG temporales
+    engine.addImageProvider(PROVIDER_ID, result_images)
+
     # Registrar todos los controladores
     filter_controller = FilterController()
     fourier_controller = FourierController()
@@ -0,0 +1,138 @@
+"""Síntesis de datasets con ruido sin interfaz gráfica
+
+Recorre un directorio de imágenes, aplica una matriz de métodos de
+`GenerateNoise` con sus parámetros y escribe los resultados junto con un
+manifiesto (manifest.jsonl). Las imágenes se reparten en un pool de procesos.
+
+Ejemplo:
+    python noise_batch.py ../images_pr/imagenes_a_color /tmp/dataset \\
+        --noise "guassiano_noise:standard_deviation=1,3,5" \\
+        --noise "impulsive_noise:noise_percentage=5,20;exact=True" \\
+        --seed 1234 --workers 16
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import cv2 as cv
+from logics.batch_io import expand_matrix, find_images, output_name, parse_spec
+from logics.noise import GenerateNoise, stream_for
+
+
+def _validate_method(method: str):
+    if method.startswith("_") or not callable(getattr(GenerateNoise, method, None)):
+        raise ValueError(f"Método de ruido desconocido: {method}")
+
+
+def _stream_key(source: str, method: str, params: dict) -> int:
+    """Clave estable del flujo aleatorio de un resultado (ruta relativa + método + parámetros)
+
+    No depende del trabajador, del orden ni de qué otras imágenes haya en el
+    directorio: el mismo resultado sale siempre con los mismos números.
+    """
+    text = json.dumps([source, method, params], sort_keys=True)
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+
+
+def _process_image(image_path, input_dir, output_dir, combos, seed):
+    """Trabajo de un proceso: carga la imagen una vez y aplica todas las combinaciones"""
+    generator = GenerateNoise(str(image_path))
+    source = image_path.relative_to(input_dir).as_posix()
+    records = []
+
+    for method, params in combos:
+        stream_key = _stream_key(source, method, params)
+        noisy = getattr(generator, method)(rng=stream_for(seed, stream_key), **params)
+
+        relative_output = output_name(image_path.relative_to(input_dir), method, params)
+        output_path = output_dir / relative_output
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not cv.imwrite(str(output_path), noisy):
+            raise ValueError(f"No se pudo escribir {output_path}")
+
+        records.append({
+            "source": source,
+            "output": str(relative_output),
+            "method": method,
+            "params": params,
+            "seed": seed,
+            "stream_key": stream_key
+        })
+
+    return records
+
+
+def run(input_dir, output_dir, combos, seed=0, workers=None, recursive=False):
+    """Procesa todas las imágenes y escribe el manifiesto a medida que terminan"""
+    input_dir, output_dir = Path(input_dir).resolve(), Path(output_dir).resolve()
+    images = find_images(input_dir, recursive)
+    if not images:
+        raise ValueError(f"No hay imágenes en {input_dir}")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / "manifest.jsonl"
+    workers = workers or os.cpu_count() or 1
+    print(f"🔧 {len(images)} imágenes x {len(combos)} combinaciones con {workers} procesos")
+
+    start = time.perf_counter()
+    written = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(manifest_path, "w") as manifest:
+        futures = {
+            pool.submit(_process_image, path, input_dir, output_dir, combos, seed): path
+            for path in images
+        }
+        for future in as_completed(futures):
+            try:
+                records = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ Error con {futures[future]}: {e}")
+                continue
+            for record in records:
+                manifest.write(json.dumps(record) + "\n")
+            written += len(records)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {written} imágenes generadas en {elapsed:.1f}s ({written / elapsed:.1f} img/s), "
+          f"{failed} fallidas. Manifiesto: {manifest_path}")
+    return manifest_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera un dataset aplicando ruido a un directorio de imágenes")
+    parser.add_argument("input_dir", help="Directorio con las imágenes originales")
+    parser.add_argument("output_dir", help="Directorio donde se escriben los resultados y el manifiesto")
+    parser.add_argument("--noise", action="append", default=[],
+                        help='Método y parámetros, p. ej. "guassiano_noise:standard_deviation=1,3" (repetible)')
+    parser.add_argument("--matrix", help='JSON {"metodo": {"param": [valores]}} con la matriz de ruido')
+    parser.add_argument("--seed", type=int, default=0, help="Semilla raíz del dataset")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos (por defecto todos los núcleos)")
+    parser.add_argument("--recursive", action="store_true", help="Buscar imágenes en subdirectorios")
+    args = parser.parse_args(argv)
+
+    specs = []
+    if args.matrix:
+        with open(args.matrix) as f:
+            specs.extend(json.load(f).items())
+    specs.extend(parse_spec(spec) for spec in args.noise)
+    if not specs:
+        parser.error("Indica al menos un --noise o un --matrix")
+
+    try:
+        for method, _ in specs:
+            _validate_method(method)
+        run(args.input_dir, args.output_dir, expand_matrix(specs), args.seed, args.workers, args.recursive)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
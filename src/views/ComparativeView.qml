@@ -10,8 +10,8 @@ GradientPage {
     property string img1Path: ""
     property string img2Path: ""
     property string diffPath: ""
-    property string hist1Path: ""
-    property string hist2Path: ""
+    property var hist1Bins: []
+    property var hist2Bins: []
 
     Connections {
         target: comparativeController
@@ -24,11 +24,11 @@ GradientPage {
         function onDiffImageReady(path) {
             diffPath = path
         }
-        function onHistogram1Ready(path) {
-            hist1Path = path
+        function onHistogram1Ready(bins) {
+            hist1Bins = bins
         }
-        function onHistogram2Ready(path) {
-            hist2Path = path
+        function onHistogram2Ready(bins) {
+            hist2Bins = bins
         }
     }
 
@@ -375,7 +375,7 @@ GradientPage {
                 Layout.fillWidth: true
                 Layout.margins: 20
                 spacing: 20
-                visible: hist1Path !== "" || hist2Path !== ""
+                visible: hist1Bins.length > 0 || hist2Bins.length > 0
 
                 Rectangle {
                     Layout.fillWidth: true
@@ -384,7 +384,7 @@ GradientPage {
                     color: "#F5F5F5"
                     border.color: "#2196F3"
                     border.width: 2
-                    visible: hist1Path !== ""
+                    visible: hist1Bins.length > 0
 
                     ColumnLayout {
                         anchors.fill: parent
@@ -396,11 +396,10 @@ GradientPage {
                             color: "#000000"
                         }
 
-                        Image {
+                        HistogramChart {
                             Layout.fillWidth: true
                             Layout.fillHeight: true
-                            source: hist1Path
-                            fillMode: Image.PreserveAspectFit
+                            bins: hist1Bins
                         }
                     }
                 }
@@ -412,7 +411,7 @@ GradientPage {
                     color: "#F5F5F5"
                     border.color: "#673AB7"
                     border.width: 2
-                    visible: hist2Path !== ""
+                    visible: hist2Bins.length > 0
 
                     ColumnLayout {
                         anchors.fill: parent
@@ -424,11 +423,10 @@ GradientPage {
                             color: "#000000"
                         }
 
-                        Image {
+                        HistogramChart {
                             Layout.fillWidth: true
                             Layout.fillHeight: true
-                            source: hist2Path
-                            fillMode: Image.PreserveAspectFit
+                            bins: hist2Bins
                         }
                     }
                 }
@@ -460,8 +458,8 @@ GradientPage {
                     img1Path = ""
                     img2Path = ""
                     diffPath = ""
-                    hist1Path = ""
-                    hist2Path = ""
+                    hist1Bins = []
+                    hist2Bins = []
                 }
             }
         }
@@ -261,6 +261,14 @@ GradientPage {
                             to: 0.5
                             value: 0.1
                             stepSize: 0.01
+
+                            // Vista previa en vivo: el controlador agrupa los movimientos
+                            onMoved: {
+                                if (originalPath !== "") {
+                                    var filterType = lowpassRadio.checked ? "lowpass" : "highpass";
+                                    fourierController.applyFourierFilter(filterType, value);
+                                }
+                            }
                         }
 
                         Label {
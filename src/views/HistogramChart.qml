@@ -0,0 +1,78 @@
+import QtQuick
+
+// Gráfica de histogramas por canal. `bins` es una lista de canales
+// (orden B, G, R de OpenCV), cada uno con 256 valores normalizados a [0, 1]
+Canvas {
+    id: root
+    property var bins: []
+    property var channelColors: ["#1565C0", "#2E7D32", "#C62828"]
+    property var channelNames: ["Canal B", "Canal G", "Canal R"]
+
+    onBinsChanged: requestPaint()
+    onWidthChanged: requestPaint()
+    onHeightChanged: requestPaint()
+
+    onPaint: {
+        var ctx = getContext("2d");
+        ctx.reset();
+        ctx.fillStyle = "#FFFFFF";
+        ctx.fillRect(0, 0, width, height);
+
+        var left = 10, right = 10, top = 10, bottom = 24;
+        var plotWidth = width - left - right;
+        var plotHeight = height - top - bottom;
+        if (plotWidth <= 0 || plotHeight <= 0 || !bins || bins.length === 0)
+            return;
+
+        // Cuadrícula
+        ctx.strokeStyle = "#E0E0E0";
+        ctx.lineWidth = 1;
+        for (var g = 0; g <= 4; g++) {
+            var gy = top + plotHeight * g / 4;
+            ctx.beginPath();
+            ctx.moveTo(left, gy);
+            ctx.lineTo(left + plotWidth, gy);
+            ctx.stroke();
+        }
+
+        // Curvas por canal
+        ctx.lineWidth = 1.5;
+        for (var c = 0; c < bins.length; c++) {
+            var values = bins[c];
+            var n = values.length;
+            ctx.strokeStyle = bins.length === 1 ? "#424242" : channelColors[c % channelColors.length];
+            ctx.beginPath();
+            for (var i = 0; i < n; i++) {
+                var x = left + plotWidth * i / (n - 1);
+                var y = top + plotHeight * (1 - values[i]);
+                if (i === 0)
+                    ctx.moveTo(x, y);
+                else
+                    ctx.lineTo(x, y);
+            }
+            ctx.stroke();
+        }
+
+        // Eje de intensidades
+        ctx.fillStyle = "#000000";
+        ctx.font = "10px sans-serif";
+        ctx.textAlign = "left";
+        ctx.fillText("0", left, height - 8);
+        ctx.textAlign = "right";
+        ctx.fillText("255", left + plotWidth, height - 8);
+        ctx.textAlign = "center";
+        ctx.fillText("Intensidad de píxel", left + plotWidth / 2, height - 8);
+
+        // Leyenda
+        if (bins.length > 1) {
+            ctx.textAlign = "left";
+            for (var k = 0; k < bins.length; k++) {
+                var ly = top + 6 + k * 14;
+                ctx.fillStyle = channelColors[k % channelColors.length];
+                ctx.fillRect(left + plotWidth - 70, ly, 10, 10);
+                ctx.fillStyle = "#000000";
+                ctx.fillText(channelNames[k % channelNames.length], left + plotWidth - 55, ly + 9);
+            }
+        }
+    }
+}